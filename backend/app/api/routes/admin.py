@@ -0,0 +1,81 @@
+"""
+Admin API route.
+Lists and downloads request profiles and the slow-request log, and reports
+per-tenant metrics.
+"""
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from app.core.config import settings
+from app.api.tenancy import request_tenant
+from app.models.schemas import ProfileListResponse, TenantListResponse, TenantProfileRequest, TenantProfileResponse
+from app.services.profiling import request_profiler
+from app.services.rag_service import rag_service
+
+router = APIRouter()
+
+
+async def require_admin(x_admin_token: str = Header(default="")):
+    """Reject requests without the configured admin token."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/api/admin/profiles", response_model=ProfileListResponse, dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """
+    List profile output files and recent slow requests.
+
+    Returns:
+        ProfileListResponse with files (newest first) and slow requests
+    """
+    return ProfileListResponse(
+        directory=str(request_profiler.output_dir),
+        profiles=request_profiler.list_profiles(),
+        slow_requests=list(request_profiler.slow_requests)
+    )
+
+
+@router.get("/api/admin/profiles/{name}", dependencies=[Depends(require_admin)])
+async def get_profile(name: str):
+    """
+    Download one profile file (speedscope JSON, collapsed stacks or trace).
+
+    Args:
+        name: File name as listed by /api/admin/profiles
+    """
+    path = request_profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {name} not found")
+    return FileResponse(path, filename=path.name)
+
+
+@router.get("/api/admin/tenants", response_model=TenantListResponse, dependencies=[Depends(require_admin)])
+async def list_tenants():
+    """
+    Per-tenant request metrics and open collection pool stats.
+
+    Returns:
+        TenantListResponse with pool occupancy and tenants, most recently active first
+    """
+    return TenantListResponse(pool=rag_service.tenants.stats(), tenants=rag_service.tenants.tenant_stats())
+
+
+@router.put("/api/admin/tenants/{tenant}", response_model=TenantProfileResponse, dependencies=[Depends(require_admin)])
+async def update_tenant(tenant: str, request: TenantProfileRequest):
+    """
+    Set the portfolio owner a tenant's assistant speaks for.
+
+    Args:
+        tenant: Tenant ID
+        request: TenantProfileRequest with the owner name
+
+    Returns:
+        TenantProfileResponse with the owner now in effect
+    """
+    result = await rag_service.set_tenant_owner(request_tenant(tenant, None), request.owner.strip())
+    if result["status"] == "error":
+        raise HTTPException(status_code=500, detail=result["message"])
+    return TenantProfileResponse(**result)
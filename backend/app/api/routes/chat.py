@@ -2,7 +2,8 @@
 Chat API route.
 Handles chat requests with RAG-enhanced responses.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from app.api.tenancy import request_tenant
 from app.models.schemas import ChatRequest, ChatResponse
 from app.services.rag_service import rag_service
 
@@ -10,20 +11,25 @@ router = APIRouter()
 
 
 @router.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, x_tenant_id: str = Header(default="")):
     """
     Chat endpoint with RAG-enhanced responses.
 
     Args:
-        request: ChatRequest with message and optional session_id
+        request: ChatRequest with message, optional session_id, retrieval filters and tenant
+        x_tenant_id: Tenant header, used when the request names no tenant
 
     Returns:
         ChatResponse with AI answer and metadata
     """
+    tenant = request_tenant(request.tenant, x_tenant_id)
     try:
         result = await rag_service.chat(
             query=request.message,
-            session_id=request.session_id
+            session_id=request.session_id,
+            filters=request.filters.model_dump(exclude_none=True) if request.filters else None,
+            deadline_ms=request.deadline_ms,
+            tenant=tenant
         )
 
         if result.get("mode") == "error":
@@ -0,0 +1,103 @@
+"""
+Documents API route.
+Lists, deletes and replaces a tenant's ingested documents by source.
+Deleting and replacing require the admin token.
+"""
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Header, HTTPException
+from app.api.routes.admin import require_admin
+from app.api.tenancy import request_tenant
+from app.core.config import settings
+from app.models.schemas import DocumentListResponse, DocumentDeleteResponse, IngestResponse
+from app.services.rag_service import NO_TEXT_ERROR, rag_service
+from app.utils.file_handler import save_uploaded_file
+
+router = APIRouter()
+
+
+@router.get("/api/documents", response_model=DocumentListResponse)
+async def list_documents(tenant: str = "", x_tenant_id: str = Header(default="")):
+    """
+    List a tenant's ingested documents.
+
+    Args:
+        tenant: Optional tenant (overrides the X-Tenant-ID header)
+
+    Returns:
+        DocumentListResponse with one entry per source
+    """
+    tenant_id = request_tenant(tenant, x_tenant_id)
+    documents = await rag_service.list_documents(tenant=tenant_id)
+    return DocumentListResponse(documents=documents, total=len(documents), tenant=tenant_id)
+
+
+@router.delete(
+    "/api/documents/{source}",
+    response_model=DocumentDeleteResponse,
+    dependencies=[Depends(require_admin)]
+)
+async def delete_document(source: str, tenant: str = "", x_tenant_id: str = Header(default="")):
+    """
+    Delete every chunk of one document.
+
+    Args:
+        source: Source name as listed by /api/documents
+        tenant: Optional tenant (overrides the X-Tenant-ID header)
+
+    Returns:
+        DocumentDeleteResponse with number of chunks deleted
+    """
+    result = await rag_service.delete_document(source, tenant=request_tenant(tenant, x_tenant_id))
+    if result["status"] == "error":
+        raise HTTPException(status_code=500 if "error" in result else 404, detail=result["message"])
+    return DocumentDeleteResponse(**result)
+
+
+@router.put("/api/documents/{source}", response_model=IngestResponse, dependencies=[Depends(require_admin)])
+async def replace_document(
+    source: str,
+    file: UploadFile = File(...),
+    tags: str = Form(default=""),
+    tenant: str = Form(default=""),
+    x_tenant_id: str = Header(default="")
+):
+    """
+    Replace one document with a new version of the PDF.
+
+    Args:
+        source: Source name to replace (created if it does not exist)
+        file: Uploaded PDF file
+        tags: Optional comma-separated tags for the new version
+        tenant: Optional tenant (overrides the X-Tenant-ID header)
+
+    Returns:
+        IngestResponse with ingestion status
+    """
+    tenant_id = request_tenant(tenant, x_tenant_id)
+    try:
+        if not file.filename.endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+        content = await file.read()
+        if len(content) > settings.max_file_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File size exceeds maximum allowed size of {settings.max_file_size} bytes"
+            )
+
+        file_path = save_uploaded_file(content, file.filename)
+        result = await rag_service.replace_document(
+            file_path,
+            source=source,
+            tags=tags.split(",") if tags else None,
+            tenant=tenant_id
+        )
+        if result["status"] == "error":
+            status_code = 422 if result.get("error") == NO_TEXT_ERROR else 500
+            raise HTTPException(status_code=status_code, detail=result["message"])
+
+        return IngestResponse(**result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Replace failed: {str(e)}")
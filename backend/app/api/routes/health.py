@@ -17,7 +17,7 @@ async def health_check():
     Returns:
         HealthResponse with service status
     """
-    vector_stats = rag_service.get_vector_store_stats()
+    vector_stats = await rag_service.get_vector_store_stats()
 
     return HealthResponse(
         status="healthy" if vector_stats.get("status") == "healthy" else "degraded",
@@ -26,7 +26,9 @@ async def health_check():
             "document_count": vector_stats.get("document_count", 0),
             "embedding_model": vector_stats.get("embedding_model", "unknown"),
             "llm": "connected",
-            "llm_base_url": settings.anthropic_base_url
+            "llm_base_url": settings.anthropic_base_url,
+            "llm_endpoints": rag_service.llm.stats(),
+            "tenant_pool": rag_service.tenants.stats()
         },
         version="1.0.0"
     )
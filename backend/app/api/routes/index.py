@@ -0,0 +1,64 @@
+"""
+Index artifact API route.
+Inspects and hot-swaps the prebuilt index artifact served for retrieval.
+Swapping requires the admin token.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from app.api.routes.admin import require_admin
+from app.core.config import settings
+from app.models.schemas import IndexLoadRequest, IndexStatusResponse
+from app.services.index_artifact import ArtifactError, resolve_artifact_path
+from app.services.rag_service import rag_service
+
+router = APIRouter()
+
+
+@router.get("/api/index", response_model=IndexStatusResponse)
+async def index_status():
+    """
+    Describe the index currently serving retrieval.
+
+    Returns:
+        IndexStatusResponse with the active artifact, if any
+    """
+    artifact = rag_service.artifact
+    if artifact is None:
+        return IndexStatusResponse(status="success", message="Serving from Chroma vector store")
+    return IndexStatusResponse(
+        status="success",
+        message=f"Serving index artifact {artifact.version}",
+        artifact=artifact.stats()
+    )
+
+
+@router.post("/api/index/load", response_model=IndexStatusResponse, dependencies=[Depends(require_admin)])
+async def load_index(request: IndexLoadRequest):
+    """
+    Load a prebuilt index artifact and atomically swap it in.
+
+    Args:
+        request: IndexLoadRequest with an artifact path under INDEX_ARTIFACT_ROOT
+
+    Returns:
+        IndexStatusResponse with the new artifact
+    """
+    try:
+        path = resolve_artifact_path(request.path, settings.index_artifact_root)
+    except ArtifactError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    result = await rag_service.load_index_artifact(str(path), verify=request.verify)
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return IndexStatusResponse(**result)
+
+
+@router.post("/api/index/unload", response_model=IndexStatusResponse, dependencies=[Depends(require_admin)])
+async def unload_index():
+    """
+    Stop serving the artifact and fall back to the Chroma collection.
+
+    Returns:
+        IndexStatusResponse with the replaced version
+    """
+    return IndexStatusResponse(**rag_service.unload_index_artifact())
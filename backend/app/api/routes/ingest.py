@@ -2,7 +2,8 @@
 Ingest API route.
 Handles PDF document upload and ingestion into vector database.
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException
+from app.api.tenancy import request_tenant
 from app.models.schemas import IngestResponse
 from app.services.rag_service import rag_service
 from app.utils.file_handler import save_uploaded_file, validate_pdf_file
@@ -12,16 +13,24 @@ router = APIRouter()
 
 
 @router.post("/api/ingest", response_model=IngestResponse)
-async def ingest_pdf(file: UploadFile = File(...)):
+async def ingest_pdf(
+    file: UploadFile = File(...),
+    tags: str = Form(default=""),
+    tenant: str = Form(default=""),
+    x_tenant_id: str = Header(default="")
+):
     """
-    Upload and process PDF into vector store.
+    Upload and process PDF into a tenant's vector store.
 
     Args:
         file: Uploaded PDF file
+        tags: Optional comma-separated tags for scoped retrieval
+        tenant: Optional tenant (overrides the X-Tenant-ID header)
 
     Returns:
         IngestResponse with ingestion status
     """
+    tenant_id = request_tenant(tenant, x_tenant_id)
     try:
         # Validate file type
         if not file.filename.endswith('.pdf'):
@@ -42,7 +51,12 @@ async def ingest_pdf(file: UploadFile = File(...)):
         file_path = save_uploaded_file(content, file.filename)
 
         # Ingest into vector store
-        result = await rag_service.ingest_pdf(file_path, metadata={"source": file.filename})
+        result = await rag_service.ingest_pdf(
+            file_path,
+            metadata={"source": file.filename},
+            tags=tags.split(",") if tags else None,
+            tenant=tenant_id
+        )
 
         return IngestResponse(**result)
 
@@ -53,18 +67,24 @@ async def ingest_pdf(file: UploadFile = File(...)):
 
 
 @router.post("/api/ingest-directory", response_model=IngestResponse)
-async def ingest_directory(directory: str = "./data/documents"):
+async def ingest_directory(
+    directory: str = "./data/documents",
+    tenant: str = "",
+    x_tenant_id: str = Header(default="")
+):
     """
-    Ingest all PDFs from a directory into vector store.
+    Ingest all PDFs from a directory into a tenant's vector store.
 
     Args:
         directory: Path to documents directory
+        tenant: Optional tenant (overrides the X-Tenant-ID header)
 
     Returns:
         IngestResponse with ingestion status
     """
+    tenant_id = request_tenant(tenant, x_tenant_id)
     try:
-        result = await rag_service.ingest_from_directory(directory)
+        result = await rag_service.ingest_from_directory(directory, tenant=tenant_id)
         return IngestResponse(**result)
 
     except Exception as e:
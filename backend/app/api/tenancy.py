@@ -0,0 +1,26 @@
+"""
+Tenant resolution shared by API routes.
+"""
+from typing import Optional
+from fastapi import HTTPException
+from app.services.tenant_pool import InvalidTenantError, resolve_tenant_id
+
+
+def request_tenant(tenant: Optional[str], x_tenant_id: Optional[str]) -> str:
+    """
+    Resolve the tenant from a request field, falling back to the X-Tenant-ID header.
+
+    Args:
+        tenant: Tenant from the request body, form or query
+        x_tenant_id: Value of the X-Tenant-ID header
+
+    Returns:
+        Normalized tenant ID (the default tenant if neither is set)
+
+    Raises:
+        HTTPException: 400 if the tenant ID is invalid
+    """
+    try:
+        return resolve_tenant_id(tenant or x_tenant_id)
+    except InvalidTenantError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -3,7 +3,7 @@ Core configuration management for Mili backend.
 Loads settings from centralized .env.local file in project root.
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Any, Dict, List
 import json
 from dotenv import load_dotenv
 from pathlib import Path
@@ -24,17 +24,70 @@ class Settings(BaseSettings):
     anthropic_auth_token: str = ""
     llm_model: str = "claude-3-5-sonnet-20241022"
 
+    # Multi-endpoint LLM Routing
+    # JSON list of {"name", "base_url", "model", "api_key", "weight"}; empty uses anthropic_base_url
+    llm_endpoints: str = ""
+    llm_hedge_enabled: bool = False  # Send a second request after the first endpoint's p95
+    llm_hedge_min_delay_ms: int = 150
+    llm_hedge_initial_delay_ms: int = 2000  # Hedge delay until an endpoint has enough samples
+    llm_ewma_alpha: float = 0.2
+    llm_circuit_failures: int = 3  # Consecutive failures before an endpoint is ejected
+    llm_circuit_cooldown_s: float = 30.0
+
+    # Latency Bounds (0 disables)
+    chat_deadline_ms: int = 30000  # End-to-end deadline for /api/chat
+    llm_first_token_timeout_ms: int = 8000  # Fall back to an extractive answer after this
+    chat_fallback_reserve_ms: int = 500  # Deadline time kept for the extractive fallback
+
     # Database & Storage
     database_path: str = "./chroma_db"
     upload_dir: str = "./uploads"
     max_file_size: int = 10485760  # 10MB
 
+    # Multi-tenant Configuration
+    default_tenant: str = "default"  # Used when a request names no tenant; keeps "mili_documents"
+    default_tenant_owner: str = "Tangzihan Xia"  # Portfolio owner named in the default tenant's prompts
+    tenant_max_open: int = 64  # Open tenant collections kept in the LRU pool
+    tenant_idle_seconds: float = 600.0  # Close tenants unused for this long; 0 disables
+    tenant_metrics_max: int = 10000  # Tenants with metrics kept in memory
+    chroma_segment_cache_mb: int = 512  # LRU budget for Chroma's loaded indexes; 0 = unbounded
+
+    # Profiling Configuration
+    profiling_enabled: bool = False  # Allow X-Profile header and sampled profiling
+    profiling_sample_rate: float = 0.0  # Fraction of requests profiled automatically
+    profiling_interval_ms: float = 5.0  # Stack sampling interval
+    profiling_format: str = "speedscope"  # speedscope or collapsed
+    profiling_dir: str = "./profiles"
+    profiling_max_profiles: int = 200  # Oldest profiles are pruned; 0 keeps all
+    slow_request_ms: int = 0  # Log requests slower than this; 0 disables
+    admin_token: str = ""  # Required by /api/admin endpoints; empty disables them
+
     # CORS Configuration
     cors_origins: str = '["http://localhost:3000"]'
 
     # Embedding Configuration
     embedding_model: str = "all-MiniLM-L6-v2"
 
+    # Retrieval Configuration
+    filtered_search_exact_max: int = 5000  # Scoped queries with fewer candidates are scored exactly
+
+    # Index Artifact Configuration
+    index_artifact_path: str = ""  # Prebuilt artifact directory served instead of Chroma
+    index_artifact_root: str = "./artifacts"  # /api/index/load only accepts paths under this; empty disables it
+    index_artifact_verify: bool = False  # Verify checksums on load (reads every file)
+    index_rescore_factor: int = 10  # Compact search rescores k * factor candidates at full precision
+
+    # Chunking Configuration
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+
+    # PDF Parsing Configuration
+    pdf_parser_backend: str = "auto"  # auto, pymupdf, pdfium, pypdf
+    pdf_parse_workers: int = 0  # 0 = one worker per CPU
+    pdf_parallel_min_pages: int = 64  # Smaller PDFs are parsed in-process
+    pdf_cache_dir: str = "./cache/parsed_pdfs"  # Empty string disables the cache
+    pdf_cache_max_entries: int = 500  # Least recently used documents are pruned; 0 keeps all
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from JSON string."""
@@ -43,6 +96,16 @@ class Settings(BaseSettings):
         except:
             return ["http://localhost:3000"]
 
+    @property
+    def llm_endpoints_list(self) -> List[Dict[str, Any]]:
+        """Parse LLM endpoints from JSON string."""
+        if not self.llm_endpoints:
+            return []
+        try:
+            return json.loads(self.llm_endpoints)
+        except ValueError:
+            return []
+
     class Config:
         # Note: env_file is ignored since we load explicitly via load_dotenv()
         # Keeping for reference, but .env.local from root is used instead
@@ -5,10 +5,21 @@ from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 
 
+class RetrievalFilters(BaseModel):
+    """Scope for retrieval; all set filters must match."""
+    sources: Optional[List[str]] = Field(default=None, description="Only chunks from these sources")
+    page_min: Optional[int] = Field(default=None, ge=0, description="First page to include (0-based)")
+    page_max: Optional[int] = Field(default=None, ge=0, description="Last page to include (0-based)")
+    tags: Optional[List[str]] = Field(default=None, description="Only chunks carrying all of these tags")
+
+
 class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
     message: str = Field(..., description="User message", min_length=1, max_length=2000)
     session_id: Optional[str] = Field(default="default", description="Session identifier for conversation history")
+    filters: Optional[RetrievalFilters] = Field(default=None, description="Restrict retrieval to matching chunks")
+    deadline_ms: Optional[int] = Field(default=None, ge=0, le=300000, description="End-to-end deadline in milliseconds (0 disables)")
+    tenant: Optional[str] = Field(default=None, description="Tenant whose documents are searched (overrides X-Tenant-ID)")
 
 
 class ChatResponse(BaseModel):
@@ -16,7 +27,9 @@ class ChatResponse(BaseModel):
     answer: str = Field(..., description="AI response")
     sources: List[Dict[str, Any]] = Field(default_factory=list, description="Source documents used")
     document_count: int = Field(default=0, description="Number of documents in vector store")
-    mode: str = Field(..., description="Response mode (rag, direct_llm, error)")
+    mode: str = Field(..., description="Response mode (rag, direct_llm, extractive, timeout, error)")
+    usage: Optional[Dict[str, int]] = Field(default=None, description="Input/output token counts, including cached input tokens")
+    tenant: Optional[str] = Field(default=None, description="Tenant that answered")
 
 
 class IngestResponse(BaseModel):
@@ -26,9 +39,67 @@ class IngestResponse(BaseModel):
     ingested: Optional[int] = Field(default=None, description="Number of documents ingested")
     total: Optional[int] = Field(default=None, description="Total number of documents")
     total_chunks: Optional[int] = Field(default=None, description="Total number of chunks created")
+    tenant: Optional[str] = Field(default=None, description="Tenant whose collection received the chunks")
+    pages: Optional[int] = Field(default=None, description="Number of PDF pages parsed")
+    pages_per_second: Optional[float] = Field(default=None, description="PDF parsing throughput")
     details: Optional[List[Dict[str, Any]]] = Field(default_factory=list, description="Detailed results per document")
 
 
+class DocumentListResponse(BaseModel):
+    """Response model for listing ingested documents."""
+    documents: List[Dict[str, Any]] = Field(default_factory=list, description="Sources with chunk, page and tag counts")
+    total: int = Field(default=0, description="Number of sources")
+    tenant: Optional[str] = Field(default=None, description="Tenant owning the documents")
+
+
+class DocumentDeleteResponse(BaseModel):
+    """Response model for deleting a document."""
+    status: str = Field(..., description="Status (success, error)")
+    message: str = Field(..., description="Status message")
+    source: str = Field(..., description="Source that was deleted")
+    deleted: int = Field(default=0, description="Number of chunks deleted")
+
+
+class IndexLoadRequest(BaseModel):
+    """Request model for hot-swapping the served index artifact."""
+    path: str = Field(..., description="Path to a prebuilt index artifact directory")
+    verify: Optional[bool] = Field(default=None, description="Verify artifact checksums before swapping")
+
+
+class IndexStatusResponse(BaseModel):
+    """Response model for index artifact operations."""
+    status: str = Field(..., description="Status (success, error)")
+    message: str = Field(..., description="Status message")
+    artifact: Optional[Dict[str, Any]] = Field(default=None, description="Active artifact summary")
+    previous_version: Optional[str] = Field(default=None, description="Version that was replaced")
+
+
+class ProfileListResponse(BaseModel):
+    """Response model for listing request profiles."""
+    directory: str = Field(..., description="Directory profiles are written to")
+    profiles: List[Dict[str, Any]] = Field(default_factory=list, description="Profile files, newest first")
+    slow_requests: List[Dict[str, Any]] = Field(default_factory=list, description="Recent requests over the slow threshold")
+
+
+class TenantListResponse(BaseModel):
+    """Response model for per-tenant metrics."""
+    pool: Dict[str, Any] = Field(default_factory=dict, description="Open collection pool occupancy and hit rate")
+    tenants: List[Dict[str, Any]] = Field(default_factory=list, description="Per-tenant metrics, most recently active first")
+
+
+class TenantProfileRequest(BaseModel):
+    """Request model for updating a tenant's persona."""
+    owner: str = Field(..., min_length=1, max_length=100, description="Portfolio owner the tenant's assistant speaks for")
+
+
+class TenantProfileResponse(BaseModel):
+    """Response model for tenant persona updates."""
+    status: str = Field(..., description="Status (success, error)")
+    message: str = Field(..., description="Status message")
+    tenant: str = Field(..., description="Tenant that was updated")
+    owner: Optional[str] = Field(default=None, description="Portfolio owner now in effect")
+
+
 class HealthResponse(BaseModel):
     """Response model for health check."""
     status: str = Field(..., description="Service status")
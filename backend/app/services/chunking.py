@@ -0,0 +1,59 @@
+"""
+PDF-to-chunk pipeline shared by live ingestion and offline index builds.
+"""
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.core.config import settings
+from app.services.pdf_parser import ParsedPDF, PDFParser
+
+
+def create_text_splitter() -> RecursiveCharacterTextSplitter:
+    """Create the text splitter configured in settings."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""]
+    )
+
+
+def parsed_pdf_to_documents(parsed: ParsedPDF, pdf_path: str, metadata: Dict[str, Any] = None) -> List[Document]:
+    """
+    Turn parsed page text into one Document per page.
+
+    Args:
+        parsed: Result of PDFParser.parse
+        pdf_path: Path the PDF was parsed from
+        metadata: Optional metadata to attach to every page
+
+    Returns:
+        List of page Documents with source and page metadata
+    """
+    documents = [
+        Document(page_content=text, metadata={"source": pdf_path, "page": page})
+        for page, text in enumerate(parsed.pages)
+    ]
+    if metadata:
+        for doc in documents:
+            doc.metadata.update(metadata)
+    return documents
+
+
+def load_pdf_chunks(
+    parser: PDFParser,
+    text_splitter: RecursiveCharacterTextSplitter,
+    pdf_path: str,
+    metadata: Dict[str, Any] = None
+) -> Tuple[ParsedPDF, List[Document]]:
+    """
+    Parse a PDF and split it into chunks.
+
+    Returns:
+        Tuple of (parse result, chunk Documents)
+    """
+    parsed = parser.parse(pdf_path)
+    documents = parsed_pdf_to_documents(parsed, pdf_path, metadata)
+    return parsed, text_splitter.split_documents(documents)
@@ -0,0 +1,27 @@
+"""
+Local embedding model shared by ingestion, retrieval and index artifact builds.
+"""
+from typing import List
+
+from sentence_transformers import SentenceTransformer
+
+from app.core.config import settings
+
+
+class LocalEmbeddings:
+    """
+    Local embeddings using SentenceTransformers.
+    Free alternative to OpenAI embeddings.
+    """
+
+    def __init__(self, model_name: str = None):
+        self.model_name = model_name or settings.embedding_model
+        self.model = SentenceTransformer(self.model_name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents."""
+        return self.model.encode(texts, convert_to_numpy=True).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query string."""
+        return self.model.encode([text], convert_to_numpy=True)[0].tolist()
@@ -0,0 +1,66 @@
+"""
+Extractive answers built locally from retrieved chunks.
+
+Used when the LLM cannot answer within the request deadline: the sentences
+of the top chunks are scored against the query embedding and the best ones
+are returned in document order.
+"""
+import re
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+def split_sentences(text: str, min_words: int = 4) -> List[str]:
+    """
+    Split chunk text into sentences, treating blank lines and bullets as breaks.
+
+    Fragments shorter than min_words (headings, stray PDF lines) are dropped.
+    """
+    sentences = []
+    for block in re.split(r"\n\s*\n|\n(?=\s*[-•*▪●]\s)", text):
+        for sentence in re.split(r"(?<=[.!?])\s+", block):
+            sentence = re.sub(r"\s+", " ", sentence).strip(" -•*▪●")
+            if len(sentence.split()) >= min_words:
+                sentences.append(sentence)
+    return sentences
+
+
+def extractive_answer(
+    query_vector: List[float],
+    docs: List[Document],
+    embeddings,
+    max_sentences: int = 3
+) -> str:
+    """
+    Pick the sentences from the retrieved chunks that best match the query.
+
+    Args:
+        query_vector: Embedding of the user query
+        docs: Retrieved chunks, best first
+        embeddings: Embedding model with ``embed_documents``
+        max_sentences: Number of sentences to return
+
+    Returns:
+        Selected sentences joined in their original order, or "" if none
+    """
+    sentences: List[str] = []
+    seen = set()
+    for doc in docs:
+        for sentence in split_sentences(doc.page_content):
+            # Overlapping chunks repeat sentences
+            if sentence not in seen:
+                seen.add(sentence)
+                sentences.append(sentence)
+    if not sentences:
+        return ""
+
+    vectors = np.asarray(embeddings.embed_documents(sentences), dtype=np.float32)
+    query = np.asarray(query_vector, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+    norms[norms == 0] = 1.0
+    scores = (vectors @ query) / norms
+
+    best = sorted(np.argsort(-scores)[:max_sentences])
+    return " ".join(sentences[i] for i in best)
@@ -0,0 +1,90 @@
+"""
+Deadline-bounded LLM generation.
+
+Streams the response so a slow upstream is detected at the first token
+rather than after the full answer, and gives up once the request's
+end-to-end deadline has passed.
+"""
+import asyncio
+from typing import List, Optional
+
+from langchain_core.messages import AIMessageChunk, BaseMessage
+
+
+def remaining_seconds(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until an event-loop-time deadline (None means no deadline)."""
+    if deadline is None:
+        return None
+    return max(deadline - asyncio.get_running_loop().time(), 0.0)
+
+
+def deadline_from_ms(deadline_ms: Optional[int]) -> Optional[float]:
+    """Convert a relative deadline in milliseconds to event-loop time (<= 0 disables)."""
+    if not deadline_ms or deadline_ms <= 0:
+        return None
+    return asyncio.get_running_loop().time() + deadline_ms / 1000
+
+
+def reserve_before(deadline: Optional[float], seconds: float) -> Optional[float]:
+    """
+    Earlier deadline that leaves time for a fallback to finish by the original one.
+
+    At most half of the remaining time is reserved, so a short deadline still
+    gives the LLM a chance.
+    """
+    if deadline is None or seconds <= 0:
+        return deadline
+    return deadline - min(seconds, remaining_seconds(deadline) / 2)
+
+
+async def generate_with_deadline(
+    llm,
+    messages: List[BaseMessage],
+    first_token_timeout: Optional[float],
+    deadline: Optional[float]
+) -> Optional[AIMessageChunk]:
+    """
+    Generate a response, or None if the upstream is too slow.
+
+    Args:
+        llm: Chat model (anything with an ``astream`` method)
+        messages: Prompt messages
+        first_token_timeout: Seconds to wait for the first text token (None waits forever)
+        deadline: Event-loop time by which the full answer must be done (None for no limit)
+
+    Returns:
+        The aggregated response, or None if the first token or the deadline was missed
+    """
+    stream = llm.astream(messages).__aiter__()
+    response: Optional[AIMessageChunk] = None
+
+    async def until_first_token() -> bool:
+        nonlocal response
+        async for chunk in stream:
+            response = chunk if response is None else response + chunk
+            if chunk.content:
+                return True
+        return False
+
+    async def until_done():
+        nonlocal response
+        async for chunk in stream:
+            response = response + chunk
+
+    try:
+        cutoff = first_token_timeout
+        remaining = remaining_seconds(deadline)
+        if remaining is not None:
+            cutoff = remaining if cutoff is None else min(cutoff, remaining)
+
+        if not await asyncio.wait_for(until_first_token(), timeout=cutoff):
+            return response
+
+        await asyncio.wait_for(until_done(), timeout=remaining_seconds(deadline))
+        return response
+
+    except asyncio.TimeoutError:
+        return None
+
+    finally:
+        await stream.aclose()
@@ -0,0 +1,445 @@
+"""
+Portable, versioned index artifacts.
+
+An artifact is a directory built offline from a documents folder that holds
+everything needed to serve retrieval without re-embedding:
+
+    manifest.json          format version, embedding model ID, counts, checksums
+    embeddings.npy         float32 (count, dimension), L2-normalized
+    texts.bin              UTF-8 chunk text, concatenated
+    text_offsets.npy       int64 (count + 1) byte offsets into texts.bin
+    metadata.bin           UTF-8 JSON chunk metadata, concatenated
+    metadata_offsets.npy   int64 (count + 1) byte offsets into metadata.bin
+    embeddings_compact.npy optional float16/int8 (count, dims) vectors for search
+    compressor.npz         optional projection and scales for the compact vectors
+
+Every file is memory mapped on load, so opening an artifact costs the same
+regardless of corpus size; pages are faulted in only when searched or read.
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.core.config import settings
+from app.services.metadata_index import MetadataIndex
+from app.services.vector_compression import (
+    COMPACT_EMBEDDINGS_NAME,
+    COMPRESSOR_NAME,
+    VectorCompressor,
+    rescore_top_k,
+)
+
+
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+EMBEDDINGS_NAME = "embeddings.npy"
+TEXTS_NAME = "texts.bin"
+TEXT_OFFSETS_NAME = "text_offsets.npy"
+METADATA_NAME = "metadata.bin"
+METADATA_OFFSETS_NAME = "metadata_offsets.npy"
+DATA_FILES = [EMBEDDINGS_NAME, TEXTS_NAME, TEXT_OFFSETS_NAME, METADATA_NAME, METADATA_OFFSETS_NAME]
+
+
+class ArtifactError(Exception):
+    """Raised when an index artifact is missing, corrupt or incompatible."""
+
+
+def sha256_file(path: Path) -> str:
+    """SHA-256 of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def resolve_artifact_path(path: str, root: str) -> Path:
+    """
+    Resolve an artifact path requested at runtime, confining it to the artifacts root.
+
+    Args:
+        path: Artifact directory, absolute or relative to the working directory
+        root: Directory that every runtime-loaded artifact must live under
+
+    Returns:
+        The resolved artifact directory
+
+    Raises:
+        ArtifactError: If no root is configured or the path escapes it
+    """
+    if not root:
+        raise ArtifactError("Runtime artifact loading is disabled (INDEX_ARTIFACT_ROOT is not set)")
+    root_path = Path(root).resolve()
+    artifact_path = Path(path).resolve()
+    if artifact_path == root_path or root_path not in artifact_path.parents:
+        raise ArtifactError(f"Artifact path must be inside {root}")
+    return artifact_path
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize vectors so a dot product is cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class StringTable:
+    """Read-only, memory-mapped table of UTF-8 strings."""
+
+    def __init__(self, blob_path: Path, offsets_path: Path):
+        self.offsets = np.load(offsets_path, mmap_mode="r")
+        self._file = open(blob_path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._blob = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._blob = b""
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+    @staticmethod
+    def write(strings: List[str], blob_path: Path, offsets_path: Path):
+        """Write strings as a concatenated blob plus byte offsets."""
+        offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        with open(blob_path, "wb") as f:
+            position = 0
+            for i, text in enumerate(strings):
+                data = text.encode("utf-8")
+                f.write(data)
+                position += len(data)
+                offsets[i + 1] = position
+        np.save(offsets_path, offsets)
+
+
+class IndexArtifact:
+    """
+    A loaded index artifact serving brute-force cosine retrieval.
+
+    Instances are immutable once loaded, which is what makes hot-swapping
+    safe: in-flight requests keep using the instance they started with.
+    """
+
+    def __init__(self, path: str, verify: bool = False, embedding_model: Optional[str] = None):
+        """
+        Open an artifact.
+
+        Args:
+            path: Artifact directory
+            verify: Verify every file against its checksum (reads every file)
+            embedding_model: Reject the artifact unless it was built with this model
+
+        Raises:
+            ArtifactError: If the artifact is missing, corrupt or incompatible
+        """
+        self.path = Path(path)
+        manifest_path = self.path / MANIFEST_NAME
+        if not manifest_path.exists():
+            raise ArtifactError(f"No {MANIFEST_NAME} in {self.path}")
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+
+        if self.manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            raise ArtifactError(
+                f"Unsupported artifact format {self.manifest.get('format_version')} "
+                f"(expected {ARTIFACT_FORMAT_VERSION})"
+            )
+        if embedding_model is not None and self.manifest.get("embedding_model") != embedding_model:
+            raise ArtifactError(
+                f"Artifact was built with '{self.manifest.get('embedding_model')}' but the service "
+                f"embeds queries with '{embedding_model}'"
+            )
+
+        for name, expected in self.manifest["files"].items():
+            file_path = self.path / name
+            if not file_path.exists() or file_path.stat().st_size != expected["bytes"]:
+                raise ArtifactError(f"Artifact file {name} is missing or truncated")
+        if verify:
+            verify_artifact(str(self.path))
+
+        self.embeddings = np.load(self.path / EMBEDDINGS_NAME, mmap_mode="r")
+        self.texts = StringTable(self.path / TEXTS_NAME, self.path / TEXT_OFFSETS_NAME)
+        self.metadatas = StringTable(self.path / METADATA_NAME, self.path / METADATA_OFFSETS_NAME)
+
+        # Compact vectors rank candidates; full-precision rows rescore them
+        self.compressor: Optional[VectorCompressor] = None
+        self.compact: Optional[np.ndarray] = None
+        if self.manifest.get("compression"):
+            self.compressor = VectorCompressor.load(self.path, self.manifest["compression"])
+            self.compact = np.load(self.path / COMPACT_EMBEDDINGS_NAME, mmap_mode="r")
+
+        if self.embeddings.shape != (self.count, self.dimension):
+            raise ArtifactError(
+                f"Embeddings shape {self.embeddings.shape} does not match manifest "
+                f"({self.count}, {self.dimension})"
+            )
+
+        # Row-level index for scoped queries, built here so that opening (done
+        # off the event loop) pays for it rather than the first scoped query
+        self.metadata_index = MetadataIndex()
+        for row in range(self.count):
+            self.metadata_index.add(row, json.loads(self.metadatas[row]))
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def embedding_model(self) -> str:
+        return self.manifest["embedding_model"]
+
+    @property
+    def count(self) -> int:
+        return self.manifest["count"]
+
+    @property
+    def dimension(self) -> int:
+        return self.manifest["dimension"]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def document(self, index: int) -> Document:
+        """Materialize one chunk as a Document."""
+        return Document(page_content=self.texts[index], metadata=json.loads(self.metadatas[index]))
+
+    def search(
+        self,
+        query_vector: List[float],
+        k: int = 4,
+        rows: Optional[Iterable[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the k most similar chunks.
+
+        Args:
+            query_vector: Query embedding
+            k: Number of results
+            rows: Optional candidate rows to restrict scoring to
+
+        Returns:
+            List of (row index, cosine similarity), best first
+        """
+        row_ids = np.fromiter(sorted(rows), dtype=np.int64) if rows is not None else None
+        total = len(row_ids) if row_ids is not None else self.count
+        if total == 0:
+            return []
+        k = min(k, total)
+        query = normalize_rows(np.asarray(query_vector, dtype=np.float32))
+
+        if self.compressor is not None:
+            compact = self.compact[row_ids] if row_ids is not None else self.compact
+            approx = self.compressor.scores(compact, self.compressor.prepare_query(query))
+            n_candidates = min(k * settings.index_rescore_factor, total)
+            candidates = np.argpartition(-approx, n_candidates - 1)[:n_candidates]
+            if row_ids is not None:
+                candidates = row_ids[candidates]
+            top_rows, top_scores = rescore_top_k(self.embeddings, query, candidates, k)
+            return [(int(row), float(score)) for row, score in zip(top_rows, top_scores)]
+
+        vectors = self.embeddings[row_ids] if row_ids is not None else self.embeddings
+        scores = vectors @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        if row_ids is not None:
+            return [(int(row_ids[i]), float(scores[i])) for i in top]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def similarity_search_by_vector(
+        self,
+        query_vector: List[float],
+        k: int = 4,
+        rows: Optional[Iterable[int]] = None
+    ) -> List[Document]:
+        """Return the k most similar chunks as Documents."""
+        return [self.document(i) for i, _ in self.search(query_vector, k, rows=rows)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary of the artifact for health and admin endpoints."""
+        return {
+            "path": str(self.path),
+            "version": self.version,
+            "embedding_model": self.embedding_model,
+            "count": self.count,
+            "dimension": self.dimension,
+            "compression": self.manifest.get("compression"),
+            "created_at": self.manifest.get("created_at"),
+        }
+
+
+def verify_artifact(path: str) -> Dict[str, Any]:
+    """
+    Check every data file against the checksums in the manifest.
+
+    Raises:
+        ArtifactError: If a file is missing or its checksum differs
+    """
+    artifact_path = Path(path)
+    with open(artifact_path / MANIFEST_NAME, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    for name, expected in manifest["files"].items():
+        file_path = artifact_path / name
+        if not file_path.exists():
+            raise ArtifactError(f"Artifact file {name} is missing")
+        if sha256_file(file_path) != expected["sha256"]:
+            raise ArtifactError(f"Checksum mismatch for {name}")
+    return manifest
+
+
+def write_artifact(
+    output_dir: str,
+    chunks: List[Document],
+    embeddings: np.ndarray,
+    embedding_model: str,
+    extra_manifest: Optional[Dict[str, Any]] = None,
+    compressor: Optional[VectorCompressor] = None
+) -> Path:
+    """
+    Write chunks and their embeddings as a new versioned artifact.
+
+    The artifact is assembled in a temporary directory and renamed into place,
+    so a reader never observes a half-written artifact.
+
+    Args:
+        output_dir: Directory that will contain the new artifact directory
+        chunks: Chunk Documents, in the same order as embeddings
+        embeddings: Array of shape (len(chunks), dimension)
+        embedding_model: ID of the model that produced the embeddings
+        extra_manifest: Additional manifest fields (e.g. chunking settings)
+        compressor: Optional unfitted compressor; fitted here and stored alongside
+
+    Returns:
+        Path to the artifact directory
+    """
+    vectors = normalize_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(chunks), -1))
+    texts = [doc.page_content for doc in chunks]
+    metadatas = [json.dumps(doc.metadata, sort_keys=True) for doc in chunks]
+
+    content_hash = hashlib.sha256(embedding_model.encode("utf-8"))
+    for text, metadata in zip(texts, metadatas):
+        content_hash.update(text.encode("utf-8"))
+        content_hash.update(metadata.encode("utf-8"))
+    created_at = datetime.now(timezone.utc)
+    version = f"{created_at:%Y%m%d%H%M%S}-{content_hash.hexdigest()[:12]}"
+
+    output_root = Path(output_dir)
+    output_root.mkdir(parents=True, exist_ok=True)
+    final_path = output_root / f"index-{version}"
+    tmp_path = output_root / f".index-{version}.tmp"
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir()
+
+    np.save(tmp_path / EMBEDDINGS_NAME, vectors)
+    StringTable.write(texts, tmp_path / TEXTS_NAME, tmp_path / TEXT_OFFSETS_NAME)
+    StringTable.write(metadatas, tmp_path / METADATA_NAME, tmp_path / METADATA_OFFSETS_NAME)
+
+    data_files = list(DATA_FILES)
+    if compressor is not None:
+        compressor.fit(vectors)
+        np.save(tmp_path / COMPACT_EMBEDDINGS_NAME, compressor.encode(vectors))
+        compressor.save(tmp_path)
+        data_files += [COMPACT_EMBEDDINGS_NAME, COMPRESSOR_NAME]
+
+    manifest = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "version": version,
+        "created_at": created_at.isoformat(),
+        "embedding_model": embedding_model,
+        "count": len(chunks),
+        "dimension": int(vectors.shape[1]) if len(chunks) else 0,
+        "sources": sorted({str(doc.metadata.get("source", "")) for doc in chunks}),
+        "files": {
+            name: {"sha256": sha256_file(tmp_path / name), "bytes": (tmp_path / name).stat().st_size}
+            for name in data_files
+        },
+        "compression": compressor.params() if compressor is not None else None,
+    }
+    if extra_manifest:
+        manifest.update(extra_manifest)
+    with open(tmp_path / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+def build_artifact(
+    documents_dir: str,
+    output_dir: str,
+    compact_mode: Optional[str] = None,
+    compact_dims: Optional[int] = None,
+    reduce_method: str = "pca"
+) -> Dict[str, Any]:
+    """
+    Parse, chunk and embed every PDF in a directory into a new artifact.
+
+    Args:
+        documents_dir: Directory of PDFs (same layout as /api/ingest-directory)
+        output_dir: Directory that will contain the new artifact directory
+        compact_mode: Also store float16 or int8 compact vectors for search
+        compact_dims: Reduce compact vectors to this many dimensions
+        reduce_method: "pca" (fitted here) or "truncate" (Matryoshka models)
+
+    Returns:
+        Dictionary with build results
+    """
+    # Imported lazily: loading an artifact must not pull in the embedding model
+    from app.services.chunking import create_text_splitter, load_pdf_chunks
+    from app.services.embeddings import LocalEmbeddings
+    from app.services.pdf_parser import PDFParser
+    from app.utils.file_handler import get_documents_from_directory
+
+    start = time.perf_counter()
+    pdf_files = sorted(get_documents_from_directory(documents_dir))
+    if not pdf_files:
+        raise ArtifactError(f"No PDF files found in {documents_dir}")
+
+    parser = PDFParser()
+    text_splitter = create_text_splitter()
+    chunks: List[Document] = []
+    try:
+        for pdf_path in pdf_files:
+            _, splits = load_pdf_chunks(parser, text_splitter, pdf_path, metadata={"source": Path(pdf_path).name})
+            chunks.extend(splits)
+    finally:
+        parser.shutdown()
+    if not chunks:
+        raise ArtifactError(f"No text could be extracted from the PDFs in {documents_dir}")
+
+    embedder = LocalEmbeddings()
+    embeddings = embedder.model.encode(
+        [doc.page_content for doc in chunks], convert_to_numpy=True, batch_size=64
+    )
+
+    path = write_artifact(
+        output_dir,
+        chunks,
+        embeddings,
+        embedder.model_name,
+        extra_manifest={
+            "chunk_size": settings.chunk_size,
+            "chunk_overlap": settings.chunk_overlap,
+        },
+        compressor=VectorCompressor(compact_mode, compact_dims, reduce_method) if compact_mode else None,
+    )
+    return {
+        "status": "success",
+        "path": str(path),
+        "documents": len(pdf_files),
+        "chunks": len(chunks),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
@@ -0,0 +1,304 @@
+"""
+Multi-endpoint LLM routing with health-weighted balancing and hedged requests.
+
+Each configured upstream keeps exponentially weighted moving averages (EWMA)
+of its time-to-first-token and error rate. Requests go to a weighted random
+endpoint favouring fast, healthy ones; endpoints that fail repeatedly are
+circuit-broken (ejected) for a cooldown and then probed again.
+
+With hedging on, if the chosen endpoint has not produced a first token after
+its own p95 latency, the same request is sent to a second endpoint and
+whichever answers first wins; the other is cancelled. An endpoint still
+waiting for its first token when the caller gives up (first-token cutoff or
+deadline) counts as failed, so hung upstreams are circuit-broken too.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import AIMessageChunk, BaseMessage
+
+from app.core.config import settings
+
+
+# Latency assumed for endpoints with no samples yet, so they get tried
+DEFAULT_LATENCY = 1.0
+# Samples needed before an endpoint's p95 is trusted as the hedge delay
+MIN_P95_SAMPLES = 10
+
+
+class NoHealthyEndpointError(RuntimeError):
+    """Raised when every endpoint failed for a request."""
+
+
+class Endpoint:
+    """One upstream LLM endpoint and its health statistics."""
+
+    def __init__(self, name: str, client: Any, base_url: str, model: str, weight: float = 1.0):
+        self.name = name
+        self.client = client
+        self.base_url = base_url
+        self.model = model
+        self.weight = weight
+
+        self.latency_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.latencies: Deque[float] = deque(maxlen=200)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+
+    def observe_latency(self, seconds: float):
+        """Fold a time-to-first-token sample into the latency EWMA."""
+        alpha = settings.llm_ewma_alpha
+        self.latencies.append(seconds)
+        if self.latency_ewma is None:
+            self.latency_ewma = seconds
+        else:
+            self.latency_ewma = alpha * seconds + (1 - alpha) * self.latency_ewma
+
+    def record_success(self, seconds: float):
+        self.observe_latency(seconds)
+        self.error_ewma *= 1 - settings.llm_ewma_alpha
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self):
+        alpha = settings.llm_ewma_alpha
+        self.error_ewma = alpha + (1 - alpha) * self.error_ewma
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= settings.llm_circuit_failures:
+            self.open_until = time.monotonic() + settings.llm_circuit_cooldown_s
+
+    def is_available(self, now: float) -> bool:
+        """Closed circuit, or open circuit whose cooldown has passed (half-open probe)."""
+        return now >= self.open_until
+
+    def circuit_state(self, now: float) -> str:
+        if self.consecutive_failures < settings.llm_circuit_failures:
+            return "closed"
+        return "open" if now < self.open_until else "half_open"
+
+    def health_score(self, default_latency: float) -> float:
+        """Selection weight: higher for fast, error-free, lightly loaded endpoints."""
+        latency = self.latency_ewma if self.latency_ewma is not None else default_latency
+        return self.weight / (max(latency, 1e-3) * (1 + 10 * self.error_ewma) * (1 + self.in_flight))
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < MIN_P95_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        p95 = self.p95()
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "model": self.model,
+            "circuit": self.circuit_state(now),
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_ewma": round(self.error_ewma, 4),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class LLMRouter:
+    """
+    Routes chat requests across endpoints; a drop-in for ChatAnthropic.astream.
+    """
+
+    def __init__(self, endpoints: List[Endpoint], hedge: bool = False, rng: Optional[random.Random] = None):
+        if not endpoints:
+            raise ValueError("LLMRouter needs at least one endpoint")
+        self.endpoints = endpoints
+        self.hedge = hedge
+        self._random = rng or random.Random()
+
+    @classmethod
+    def from_settings(cls) -> "LLMRouter":
+        """Build endpoints from settings.llm_endpoints, or the single anthropic_base_url."""
+        configs = settings.llm_endpoints_list or [{
+            "name": "default",
+            "base_url": settings.anthropic_base_url,
+            "model": settings.llm_model,
+        }]
+        # With several endpoints, failover replaces the client's own retries
+        max_retries = 0 if len(configs) > 1 else 2
+
+        endpoints = []
+        for i, config in enumerate(configs):
+            model = config.get("model", settings.llm_model)
+            base_url = config.get("base_url", settings.anthropic_base_url)
+            client = ChatAnthropic(
+                model=model,
+                anthropic_api_key=config.get("api_key", settings.anthropic_api_key),
+                base_url=base_url,
+                temperature=0.7,
+                max_retries=max_retries
+            )
+            endpoints.append(Endpoint(
+                name=config.get("name", f"endpoint-{i}"),
+                client=client,
+                base_url=base_url,
+                model=model,
+                weight=float(config.get("weight", 1.0))
+            ))
+        return cls(endpoints, hedge=settings.llm_hedge_enabled)
+
+    def _default_latency(self) -> float:
+        known = [e.latency_ewma for e in self.endpoints if e.latency_ewma is not None]
+        return min(known) if known else DEFAULT_LATENCY
+
+    def select(self, exclude: Tuple[Endpoint, ...] = ()) -> Optional[Endpoint]:
+        """
+        Pick an endpoint at random, weighted by health score.
+
+        Circuit-broken endpoints are skipped; if every endpoint is broken, the
+        one whose cooldown ends soonest is used rather than failing outright.
+        """
+        candidates = [e for e in self.endpoints if e not in exclude]
+        if not candidates:
+            return None
+
+        now = time.monotonic()
+        available = [e for e in candidates if e.is_available(now)]
+        if not available:
+            return min(candidates, key=lambda e: e.open_until)
+
+        default_latency = self._default_latency()
+        weights = [e.health_score(default_latency) for e in available]
+        return self._random.choices(available, weights=weights, k=1)[0]
+
+    def hedge_delay(self, endpoint: Endpoint) -> float:
+        """How long to wait for a first token before hedging to another endpoint."""
+        minimum = settings.llm_hedge_min_delay_ms / 1000
+        p95 = endpoint.p95()
+        if p95 is None:
+            return max(minimum, settings.llm_hedge_initial_delay_ms / 1000)
+        return max(minimum, p95)
+
+    async def _first_token(
+        self,
+        endpoint: Endpoint,
+        messages: List[BaseMessage]
+    ) -> Tuple[Endpoint, AsyncIterator[AIMessageChunk], List[AIMessageChunk]]:
+        """Open a stream and read up to the first text token."""
+        stream = endpoint.client.astream(messages).__aiter__()
+        buffered: List[AIMessageChunk] = []
+        endpoint.requests += 1
+        endpoint.in_flight += 1
+        start = time.perf_counter()
+        try:
+            async for chunk in stream:
+                buffered.append(chunk)
+                if chunk.content:
+                    break
+            endpoint.record_success(time.perf_counter() - start)
+            return endpoint, stream, buffered
+        except asyncio.CancelledError:
+            # Lost a hedge race: it was at least this slow
+            endpoint.observe_latency(time.perf_counter() - start)
+            await stream.aclose()
+            raise
+        except Exception:
+            endpoint.record_failure()
+            await stream.aclose()
+            raise
+        finally:
+            endpoint.in_flight -= 1
+
+    async def astream(self, messages: List[BaseMessage]) -> AsyncIterator[AIMessageChunk]:
+        """
+        Stream a response from the best endpoint, hedging and failing over as needed.
+
+        Raises:
+            NoHealthyEndpointError: If every endpoint tried failed before a first token
+        """
+        tasks: Dict[asyncio.Task, Endpoint] = {}
+        tried: List[Endpoint] = []
+        hedged = False
+        last_error: Optional[BaseException] = None
+        winner = None
+
+        def launch(endpoint: Endpoint):
+            tried.append(endpoint)
+            tasks[asyncio.ensure_future(self._first_token(endpoint, messages))] = endpoint
+
+        try:
+            launch(self.select())
+            while tasks and winner is None:
+                can_hedge = self.hedge and not hedged and len(tried) < len(self.endpoints)
+                timeout = self.hedge_delay(tried[0]) if can_hedge else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # First token is late: send the same request to another endpoint
+                    hedged = True
+                    alternative = self.select(exclude=tuple(tried))
+                    if alternative is not None:
+                        launch(alternative)
+                    continue
+
+                for task in done:
+                    tasks.pop(task)
+                    if task.exception() is None:
+                        winner = task.result()
+                        break
+                    last_error = task.exception()
+
+                if winner is None and not tasks:
+                    # Every in-flight attempt failed: fail over to an untried endpoint
+                    alternative = self.select(exclude=tuple(tried))
+                    if alternative is not None:
+                        launch(alternative)
+        finally:
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for endpoint, result in zip(tasks.values(), results):
+                if isinstance(result, tuple):
+                    # Finished in the same instant as the winner: close its stream too
+                    await result[1].aclose()
+                elif winner is None and isinstance(result, asyncio.CancelledError):
+                    # No winner: the caller's first-token cutoff or deadline gave up on
+                    # this endpoint, so it is a failure rather than a lost hedge race
+                    endpoint.record_failure()
+
+        if winner is None:
+            raise NoHealthyEndpointError(f"All LLM endpoints failed: {last_error}") from last_error
+
+        endpoint, stream, buffered = winner
+        try:
+            for chunk in buffered:
+                yield chunk
+            async for chunk in stream:
+                yield chunk
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            endpoint.record_failure()
+            raise
+        finally:
+            await stream.aclose()
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> AIMessageChunk:
+        """Aggregate a routed stream into one message."""
+        response: Optional[AIMessageChunk] = None
+        async for chunk in self.astream(messages):
+            response = chunk if response is None else response + chunk
+        return response
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint health for the health endpoint."""
+        return [endpoint.stats() for endpoint in self.endpoints]
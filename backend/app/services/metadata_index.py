@@ -0,0 +1,179 @@
+"""
+Secondary metadata index over chunk source, page and tags.
+
+Resolves retrieval filters to a candidate set of chunk IDs before any vector
+scoring, and makes per-source list/delete/replace a lookup instead of a scan
+over the collection.
+"""
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+TAG_KEY_PREFIX = "tag:"
+
+
+def tags_to_metadata(tags: Iterable[str]) -> Dict[str, Any]:
+    """
+    Encode tags as chunk metadata.
+
+    Chroma metadata values must be scalars, so tags are stored both as a
+    comma-separated "tags" string (for display) and as one boolean
+    "tag:<name>" key each (so Chroma's where clause can filter on them).
+    """
+    cleaned = sorted({tag.strip() for tag in tags if tag and tag.strip()})
+    if not cleaned:
+        return {}
+    metadata: Dict[str, Any] = {"tags": ",".join(cleaned)}
+    metadata.update({f"{TAG_KEY_PREFIX}{tag}": True for tag in cleaned})
+    return metadata
+
+
+def metadata_tags(metadata: Dict[str, Any]) -> List[str]:
+    """Read the tags back from chunk metadata."""
+    return [key[len(TAG_KEY_PREFIX):] for key, value in metadata.items() if key.startswith(TAG_KEY_PREFIX) and value]
+
+
+class MetadataIndex:
+    """
+    In-memory inverted index from source, page and tag to chunk IDs.
+
+    IDs are opaque: Chroma chunk IDs for the live collection, row numbers
+    for an index artifact.
+    """
+
+    def __init__(self):
+        self.by_source: Dict[str, Set[Hashable]] = {}
+        self.by_page: Dict[int, Set[Hashable]] = {}
+        self.by_tag: Dict[str, Set[Hashable]] = {}
+        self._entries: Dict[Hashable, tuple] = {}  # id -> (source, page, tags)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, chunk_id: Hashable, metadata: Dict[str, Any]):
+        """Index one chunk by its metadata."""
+        if chunk_id in self._entries:
+            self.remove(chunk_id)
+        source = str(metadata.get("source", ""))
+        page = metadata.get("page")
+        page = int(page) if page is not None else None
+        tags = tuple(metadata_tags(metadata))
+
+        self._entries[chunk_id] = (source, page, tags)
+        self.by_source.setdefault(source, set()).add(chunk_id)
+        if page is not None:
+            self.by_page.setdefault(page, set()).add(chunk_id)
+        for tag in tags:
+            self.by_tag.setdefault(tag, set()).add(chunk_id)
+
+    def remove(self, chunk_id: Hashable):
+        """Drop one chunk from the index."""
+        entry = self._entries.pop(chunk_id, None)
+        if entry is None:
+            return
+        source, page, tags = entry
+        self._discard(self.by_source, source, chunk_id)
+        if page is not None:
+            self._discard(self.by_page, page, chunk_id)
+        for tag in tags:
+            self._discard(self.by_tag, tag, chunk_id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[Hashable]], key: Any, chunk_id: Hashable):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(chunk_id)
+            if not ids:
+                del index[key]
+
+    def source_ids(self, source: str) -> Set[Hashable]:
+        """IDs of every chunk from a source (a copy, safe to mutate)."""
+        return set(self.by_source.get(source, ()))
+
+    def remove_source(self, source: str) -> Set[Hashable]:
+        """Drop every chunk from a source and return their IDs."""
+        ids = self.source_ids(source)
+        for chunk_id in ids:
+            self.remove(chunk_id)
+        return ids
+
+    def candidates(
+        self,
+        sources: Optional[List[str]] = None,
+        page_min: Optional[int] = None,
+        page_max: Optional[int] = None,
+        tags: Optional[List[str]] = None
+    ) -> Optional[Set[Hashable]]:
+        """
+        Resolve filters to the set of matching chunk IDs.
+
+        Sources are OR-ed, tags are AND-ed, and the page range is inclusive.
+
+        Returns:
+            Matching IDs, or None when no filter is set (everything matches)
+        """
+        groups: List[Set[Hashable]] = []
+
+        if sources:
+            groups.append(set().union(*(self.by_source.get(source, set()) for source in sources)))
+
+        if page_min is not None or page_max is not None:
+            low = page_min if page_min is not None else float("-inf")
+            high = page_max if page_max is not None else float("inf")
+            groups.append(set().union(*(ids for page, ids in self.by_page.items() if low <= page <= high)))
+
+        for tag in tags or []:
+            groups.append(self.by_tag.get(tag, set()))
+
+        if not groups:
+            return None
+
+        # Intersect smallest first so the work is bounded by the most selective filter
+        groups.sort(key=len)
+        result = set(groups[0])
+        for group in groups[1:]:
+            if not result:
+                break
+            result &= group
+        return result
+
+    def list_sources(self) -> List[Dict[str, Any]]:
+        """Summarize every indexed source."""
+        summaries = []
+        for source in sorted(self.by_source):
+            pages: Set[int] = set()
+            tags: Set[str] = set()
+            for chunk_id in self.by_source[source]:
+                _, page, chunk_tags = self._entries[chunk_id]
+                if page is not None:
+                    pages.add(page)
+                tags.update(chunk_tags)
+            summaries.append({
+                "source": source,
+                "chunks": len(self.by_source[source]),
+                "pages": len(pages),
+                "tags": sorted(tags),
+            })
+        return summaries
+
+
+def build_where_filter(
+    sources: Optional[List[str]] = None,
+    page_min: Optional[int] = None,
+    page_max: Optional[int] = None,
+    tags: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """Translate retrieval filters into a Chroma where clause."""
+    clauses: List[Dict[str, Any]] = []
+    if sources:
+        clauses.append({"source": {"$in": list(sources)}})
+    if page_min is not None:
+        clauses.append({"page": {"$gte": page_min}})
+    if page_max is not None:
+        clauses.append({"page": {"$lte": page_max}})
+    for tag in tags or []:
+        clauses.append({f"{TAG_KEY_PREFIX}{tag}": True})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
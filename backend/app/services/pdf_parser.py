@@ -0,0 +1,307 @@
+"""
+PDF parsing engine for document ingestion.
+
+Extracts per-page text using the fastest available local backend, parses
+large documents in parallel page ranges across processes, and caches the
+extracted text keyed by file content hash so that re-ingesting with different
+chunking or embedding settings never re-parses the PDF. The cache keeps the
+``pdf_cache_max_entries`` most recently used documents.
+
+``parse`` blocks until the text is extracted; async callers should run it in
+a thread (``asyncio.to_thread``) so the event loop keeps serving requests.
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+
+# Backends in order of preference for "auto" (fastest first)
+BACKEND_PREFERENCE = ["pymupdf", "pdfium", "pypdf"]
+
+
+@dataclass
+class ParsedPDF:
+    """Result of parsing a PDF into per-page text."""
+    pages: List[str]
+    backend: str
+    elapsed: float
+    cached: bool = False
+    content_hash: str = ""
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def pages_per_second(self) -> float:
+        """Parsing throughput; cache hits report the (fast) load time."""
+        if self.elapsed <= 0:
+            return float(self.page_count)
+        return round(self.page_count / self.elapsed, 2)
+
+
+def backend_available(backend: str) -> bool:
+    """Check whether the library behind a parser backend is importable."""
+    try:
+        if backend == "pymupdf":
+            import fitz  # noqa: F401
+        elif backend == "pdfium":
+            import pypdfium2  # noqa: F401
+        elif backend == "pypdf":
+            import pypdf  # noqa: F401
+        else:
+            return False
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    """
+    Resolve a configured backend name to an installed one.
+
+    Args:
+        backend: "auto" or one of BACKEND_PREFERENCE
+
+    Returns:
+        Name of an importable backend
+    """
+    if backend != "auto":
+        if not backend_available(backend):
+            raise ValueError(f"PDF parser backend '{backend}' is not installed")
+        return backend
+
+    for candidate in BACKEND_PREFERENCE:
+        if backend_available(candidate):
+            return candidate
+    raise ValueError("No PDF parser backend installed (install pypdf, pymupdf or pypdfium2)")
+
+
+def count_pages(pdf_path: str, backend: str) -> int:
+    """Return the number of pages in a PDF using the given backend."""
+    if backend == "pymupdf":
+        import fitz
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+    if backend == "pdfium":
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    from pypdf import PdfReader
+    return len(PdfReader(pdf_path).pages)
+
+
+def extract_page_range(pdf_path: str, backend: str, start: int, end: int) -> List[str]:
+    """
+    Extract text for pages [start, end) of a PDF.
+
+    Module-level so it can run inside worker processes.
+    """
+    if backend == "pymupdf":
+        import fitz
+        with fitz.open(pdf_path) as doc:
+            return [doc.load_page(i).get_text() for i in range(start, end)]
+
+    if backend == "pdfium":
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            texts = []
+            for i in range(start, end):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
+
+    from pypdf import PdfReader
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def split_page_ranges(page_count: int, workers: int, min_pages_per_range: int) -> List[Tuple[int, int]]:
+    """
+    Split [0, page_count) into contiguous ranges for parallel parsing.
+
+    Uses a few ranges per worker so a slow range does not stall the pool.
+    """
+    if page_count <= 0:
+        return []
+    target_ranges = max(1, workers * 2)
+    size = max(min_pages_per_range, math.ceil(page_count / target_ranges))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def hash_file(pdf_path: str) -> str:
+    """SHA-256 of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PDFParser:
+    """
+    Pluggable PDF text extractor with parallel page ranges and a parsed-text cache.
+    """
+
+    def __init__(
+        self,
+        backend: str = None,
+        workers: int = None,
+        parallel_min_pages: int = None,
+        cache_dir: Optional[str] = None,
+        cache_max_entries: Optional[int] = None,
+    ):
+        self.backend = resolve_backend(backend or settings.pdf_parser_backend)
+        self.workers = workers if workers is not None else (settings.pdf_parse_workers or os.cpu_count() or 1)
+        self.parallel_min_pages = (
+            parallel_min_pages if parallel_min_pages is not None else settings.pdf_parallel_min_pages
+        )
+        cache_dir = settings.pdf_cache_dir if cache_dir is None else cache_dir
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_max_entries = (
+            cache_max_entries if cache_max_entries is not None else settings.pdf_cache_max_entries
+        )
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # parse() may run on several threads at once
+        self._lock = threading.Lock()
+
+    def _cache_path(self, content_hash: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{content_hash}.{self.backend}.json"
+
+    def _load_cached(self, content_hash: str) -> Optional[List[str]]:
+        path = self._cache_path(content_hash)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                pages = json.load(f)["pages"]
+            os.utime(path)  # Mark as recently used for pruning
+            return pages
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store_cached(self, content_hash: str, pages: List[str]):
+        path = self._cache_path(content_hash)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"backend": self.backend, "pages": pages}, f)
+        os.replace(tmp_path, path)
+        self._prune_cache()
+
+    def _prune_cache(self):
+        """Keep only the most recently used cache entries."""
+        if self.cache_dir is None or self.cache_max_entries <= 0:
+            return
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue  # Removed by a concurrent prune
+            entries.sort()
+            for _, path in entries[:-self.cache_max_entries]:
+                path.unlink(missing_ok=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Spawned (not forked) workers: the parent holds torch/tokenizer threads
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+            return self._pool
+
+    def _extract(self, pdf_path: str) -> List[str]:
+        page_count = count_pages(pdf_path, self.backend)
+        if self.workers <= 1 or page_count < self.parallel_min_pages:
+            return extract_page_range(pdf_path, self.backend, 0, page_count)
+
+        ranges = split_page_ranges(page_count, self.workers, min_pages_per_range=8)
+        pool = self._get_pool()
+        try:
+            futures = [
+                pool.submit(extract_page_range, pdf_path, self.backend, start, end)
+                for start, end in ranges
+            ]
+            pages: List[str] = []
+            for future in futures:
+                pages.extend(future.result())
+            return pages
+        except BrokenProcessPool:
+            # A worker died (crash or OOM): later parses get a fresh pool,
+            # and this document is parsed in-process
+            self._discard_pool(pool)
+            return extract_page_range(pdf_path, self.backend, 0, page_count)
+
+    def parse(self, pdf_path: str) -> ParsedPDF:
+        """
+        Parse a PDF into per-page text, using the cache when possible.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            ParsedPDF with page texts and throughput stats
+        """
+        start = time.perf_counter()
+        content_hash = hash_file(pdf_path)
+
+        pages = self._load_cached(content_hash)
+        if pages is not None:
+            return ParsedPDF(
+                pages=pages,
+                backend=self.backend,
+                elapsed=time.perf_counter() - start,
+                cached=True,
+                content_hash=content_hash,
+            )
+
+        pages = self._extract(pdf_path)
+        self._store_cached(content_hash, pages)
+
+        return ParsedPDF(
+            pages=pages,
+            backend=self.backend,
+            elapsed=time.perf_counter() - start,
+            cached=False,
+            content_hash=content_hash,
+        )
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool so the next parallel parse starts a new one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop worker processes, if any were started."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
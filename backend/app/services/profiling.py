@@ -0,0 +1,361 @@
+"""
+On-demand request profiling for Mili AI Assistant.
+
+Provides:
+- Per-request span traces (embed, retrieve, llm, persist, ...) via trace_span()
+- A wall-clock stack sampler attached to a single request, covering the
+  event loop and any busy worker threads (parse and embed run in threads)
+- A slow-request log for requests over a threshold
+- Profile output as speedscope JSON or collapsed stacks in a local directory
+
+When no trace is active, trace_span() returns a shared no-op object, so the
+instrumentation left in the service code costs one context variable lookup.
+"""
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+logger = logging.getLogger("mili.profiling")
+
+PROFILE_HEADER = "x-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+SLOW_LOG_NAME = "slow_requests.jsonl"
+
+Frame = Tuple[str, str, int]  # (function name, file, first line)
+Stack = Tuple[Frame, ...]
+
+# Thread and executor machinery: a stack of only these frames is a thread waiting for work
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", os.path.join("concurrent", "futures", "thread.py"))
+
+
+def _is_idle(stack: Stack) -> bool:
+    return all(file.endswith(_IDLE_FILES) for _, file, _ in stack)
+
+
+class _NullSpan:
+    """No-op span used when the current request is not traced."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("mili_trace", default=None)
+
+
+class Trace:
+    """Timing spans recorded for a single request."""
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.duration_ms: Optional[float] = None
+
+    def finish(self) -> float:
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+        return self.duration_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "spans": self.spans,
+        }
+
+
+class _Span:
+    """Records one named span on a trace."""
+
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.trace.spans.append({
+            "name": self.name,
+            "start_ms": round((self.start - self.trace._start) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+def trace_span(name: str):
+    """
+    Time a block as a named span of the current request's trace.
+
+    Usage:
+        with trace_span("retrieve"):
+            docs = search(...)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace of the request being handled, if it is traced."""
+    return _current_trace.get()
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples call stacks at a fixed interval, labelled by thread.
+
+    The request's own (event loop) thread is always sampled. Other threads
+    are sampled while busy, since work such as PDF parsing and embedding is
+    dispatched to worker threads. Samples therefore also include concurrent
+    requests on the same loop or executor.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="mili-stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.thread_name = next(
+            (t.name for t in threading.enumerate() if t.ident == thread_id), f"thread-{thread_id}"
+        )
+        self.interval = interval
+        self.samples: "Counter[Tuple[str, Stack]]" = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_file = __file__
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack: List[Frame] = []
+                while frame is not None:
+                    code = frame.f_code
+                    if code.co_filename != own_file:
+                        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                if not stack or (thread_id != self.thread_id and _is_idle(stack)):
+                    continue
+                stack.reverse()
+                thread_name = names.get(thread_id, f"thread-{thread_id}")
+                self.samples[(thread_name, tuple(stack))] += 1
+
+    def threads(self) -> List[str]:
+        """Sampled thread names, the request's thread first, then by sample count."""
+        counts: Counter = Counter()
+        for (thread_name, _), count in self.samples.items():
+            counts[thread_name] += count
+        return sorted(counts, key=lambda name: (name != self.thread_name, -counts[name]))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
+
+    def to_collapsed(self) -> str:
+        """Collapsed stack format (one 'thread;root;...;leaf count' line per stack)."""
+        lines = []
+        for (thread_name, stack), count in self.samples.most_common():
+            frames = ";".join(f"{name} ({Path(file).name}:{line})" for name, file, line in stack)
+            lines.append(f"[{thread_name}];{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """Sampled profile in speedscope's file format, one profile per thread."""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        by_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {t: ([], []) for t in self.threads()}
+        interval_ms = self.interval * 1000
+
+        for (thread_name, stack), count in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            samples, weights = by_thread[thread_name]
+            samples.append(indices)
+            weights.append(count * interval_ms)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{name} [{thread_name}]",
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread_name, (samples, weights) in by_thread.items()
+            ],
+            "name": name,
+            "exporter": "mili-profiler",
+        }
+
+
+class RequestProfiler:
+    """
+    Decides which requests to trace or profile and stores the results.
+    """
+
+    def __init__(self):
+        self.output_dir = Path(settings.profiling_dir)
+        self.slow_requests: Deque[Dict[str, Any]] = deque(maxlen=200)
+        self._lock = threading.Lock()
+
+    @property
+    def tracing_enabled(self) -> bool:
+        return settings.profiling_enabled or settings.slow_request_ms > 0
+
+    def should_profile(self, headers) -> bool:
+        """Profile when an admin asks by header, or when picked by the sampling rate."""
+        if not settings.profiling_enabled:
+            return False
+        if headers.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes") and settings.admin_token:
+            # Only admins may start samplers and profile writes on demand
+            if secrets.compare_digest(headers.get(ADMIN_TOKEN_HEADER, ""), settings.admin_token):
+                return True
+        return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+    def start(self, method: str, path: str, profile: bool) -> Tuple[Trace, Optional[StackSampler], Any]:
+        """
+        Begin tracing the current request.
+
+        Returns:
+            Tuple of (trace, sampler or None, context token for finish())
+        """
+        trace = Trace(uuid.uuid4().hex[:12], method, path)
+        token = _current_trace.set(trace)
+        sampler = None
+        if profile:
+            sampler = StackSampler(threading.get_ident(), settings.profiling_interval_ms / 1000)
+            sampler.start()
+        return trace, sampler, token
+
+    def finish(self, trace: Trace, sampler: Optional[StackSampler], token: Any, status_code: int) -> Dict[str, Any]:
+        """
+        Stop tracing the current request and log it if it was slow.
+
+        Must run in the request's own context (it resets the trace variable).
+
+        Returns:
+            The trace record, to pass to write_profile() when profiled
+        """
+        _current_trace.reset(token)
+        duration_ms = trace.finish()
+        if sampler is not None:
+            sampler.stop()
+
+        record = trace.to_dict()
+        record["status_code"] = status_code
+
+        if settings.slow_request_ms > 0 and duration_ms >= settings.slow_request_ms:
+            self._log_slow(record)
+        return record
+
+    def _log_slow(self, record: Dict[str, Any]):
+        logger.warning(
+            "Slow request %s %s took %.1fms (%s)",
+            record["method"],
+            record["path"],
+            record["duration_ms"],
+            ", ".join(f"{s['name']}={s['duration_ms']:.1f}ms" for s in record["spans"]) or "no spans",
+        )
+        self.slow_requests.append(record)
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock, open(self.output_dir / SLOW_LOG_NAME, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.error("Could not write slow request log: %s", e)
+
+    def write_profile(self, record: Dict[str, Any], sampler: StackSampler) -> str:
+        """
+        Write a profiled request's trace and stacks to the output directory.
+
+        Returns:
+            File name prefix shared by the written files
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{record['request_id']}"
+        name = f"{record['method']} {record['path']} ({record['duration_ms']:.0f}ms)"
+
+        with open(self.output_dir / f"{prefix}.trace.json", "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        if settings.profiling_format == "collapsed":
+            (self.output_dir / f"{prefix}.folded").write_text(sampler.to_collapsed(), encoding="utf-8")
+        else:
+            with open(self.output_dir / f"{prefix}.speedscope.json", "w", encoding="utf-8") as f:
+                json.dump(sampler.to_speedscope(name), f)
+
+        self._prune()
+        return prefix
+
+    def _prune(self):
+        """Keep only the newest profiles."""
+        if settings.profiling_max_profiles <= 0:
+            return
+        profiles = sorted(self.output_dir.glob("*.trace.json"), key=lambda p: p.stat().st_mtime)
+        for trace_file in profiles[:-settings.profiling_max_profiles]:
+            prefix = trace_file.name[:-len(".trace.json")]
+            for path in self.output_dir.glob(f"{prefix}.*"):
+                path.unlink(missing_ok=True)
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """List profile output files, newest first."""
+        if not self.output_dir.exists():
+            return []
+        files = [p for p in self.output_dir.iterdir() if p.is_file() and p.name != SLOW_LOG_NAME]
+        files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        return [
+            {
+                "name": p.name,
+                "bytes": p.stat().st_size,
+                "modified_at": datetime.fromtimestamp(p.stat().st_mtime, timezone.utc).isoformat(),
+            }
+            for p in files
+        ]
+
+    def profile_path(self, name: str) -> Optional[Path]:
+        """Resolve a listed profile file name, rejecting anything outside the directory."""
+        if not name or "/" in name or "\\" in name or name.startswith("."):
+            return None
+        path = self.output_dir / name
+        return path if path.is_file() else None
+
+
+# Global profiler instance
+request_profiler = RequestProfiler()
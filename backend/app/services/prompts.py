@@ -0,0 +1,127 @@
+"""
+Prompt construction for Mili chat, laid out for Anthropic prompt caching.
+
+Messages are ordered from most to least stable so the upstream can reuse
+cached prefixes:
+
+    system   static instructions                 <- cache breakpoint
+    user     retrieved context (sorted)          <- cache breakpoint
+    user     question                             (never cached)
+
+Retrieved chunks are sorted deterministically, so the same set of chunks
+always renders to the same bytes regardless of retrieval score order. The
+system prompt names the tenant's portfolio owner, so it is cached per tenant.
+
+Direct (no context) prompts carry no breakpoint: they are far below the
+minimum prefix length Anthropic caches, so a breakpoint would never hit.
+"""
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+
+SYSTEM_PROMPT_TEMPLATE = """You are Mili, a helpful AI assistant for {site}.
+Your role is to answer questions about {subject} background, skills, projects, and work experience.
+
+Use the pieces of context provided by the user to answer the question at the end.
+If you don't know the answer based on the context, just say that you don't know.
+
+Rules:
+1. Keep your answers within 1-2 paragraphs unless user asks for more detail.
+2. Try to use bullet points for clarity when listing information.
+3. Try to end your responses with 1-2 follow-up questions that the user might find interesting.
+
+Restrictions:
+1. Do not make up answers that are not supported by facts and context.
+2. Do not include your thought process in the final answer."""
+
+DIRECT_SYSTEM_PROMPT_TEMPLATE = "You are Mili, a helpful AI assistant for {site}."
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _persona(owner: Optional[str]) -> Dict[str, str]:
+    """Template values naming the portfolio owner, or a neutral persona if unknown."""
+    if owner:
+        return {"site": f"{owner}'s portfolio website", "subject": f"{owner}'s"}
+    return {"site": "this portfolio website", "subject": "the portfolio owner's"}
+
+
+def system_prompt(owner: Optional[str] = None) -> str:
+    """Static RAG instructions for one portfolio owner."""
+    return SYSTEM_PROMPT_TEMPLATE.format(**_persona(owner))
+
+
+def direct_system_prompt(owner: Optional[str] = None) -> str:
+    """Instructions for answering without retrieved context."""
+    return DIRECT_SYSTEM_PROMPT_TEMPLATE.format(**_persona(owner))
+
+
+def _cached_text(text: str) -> Dict[str, Any]:
+    return {"type": "text", "text": text, "cache_control": CACHE_CONTROL}
+
+
+def order_context(docs: List[Document]) -> List[Document]:
+    """Sort chunks by source, page and text so a given set renders identically."""
+    return sorted(
+        docs,
+        key=lambda doc: (
+            str(doc.metadata.get("source", "")),
+            doc.metadata.get("page", -1),
+            doc.page_content,
+        ),
+    )
+
+
+def build_rag_messages(docs: List[Document], query: str, owner: Optional[str] = None) -> List[BaseMessage]:
+    """
+    Build cache-friendly chat messages for a RAG query.
+
+    Args:
+        docs: Retrieved chunks, in any order
+        query: User question
+        owner: Portfolio owner the assistant speaks for (neutral persona if None)
+
+    Returns:
+        Messages with cache breakpoints after the system prompt and context
+    """
+    context = "\n\n".join(doc.page_content for doc in order_context(docs))
+    return [
+        SystemMessage(content=[_cached_text(system_prompt(owner))]),
+        HumanMessage(content=[
+            _cached_text(f"Context:\n{context}"),
+            {"type": "text", "text": f"Question: {query}\n\nHelpful Answer:"},
+        ]),
+    ]
+
+
+def build_direct_messages(query: str, owner: Optional[str] = None) -> List[BaseMessage]:
+    """Build chat messages for answering without retrieved context (not cached)."""
+    return [
+        SystemMessage(content=direct_system_prompt(owner)),
+        HumanMessage(content=f"Answer: {query}"),
+    ]
+
+
+def extract_usage(response: Any) -> Optional[Dict[str, int]]:
+    """
+    Report cached and uncached input tokens for an LLM response.
+
+    Returns:
+        Token counts, or None if the upstream did not report usage
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return None
+    details = usage.get("input_token_details") or {}
+    input_tokens = usage.get("input_tokens", 0) or 0
+    cache_read = details.get("cache_read") or 0
+    cache_creation = details.get("cache_creation") or 0
+    return {
+        "input_tokens": input_tokens,
+        "cached_input_tokens": cache_read,
+        "cache_creation_input_tokens": cache_creation,
+        "uncached_input_tokens": max(input_tokens - cache_read, 0),
+        "output_tokens": usage.get("output_tokens", 0) or 0,
+    }
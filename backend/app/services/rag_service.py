@@ -3,24 +3,51 @@ RAG (Retrieval-Augmented Generation) Service for Mili AI Assistant.
 
 Handles document ingestion, vector storage, and retrieval-augmented chat.
 """
+import asyncio
 import os
 import re
+import time
+import uuid
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_anthropic import ChatAnthropic
+import chromadb
+import numpy as np
+from chromadb.config import Settings as ChromaSettings
 from langchain_community.vectorstores import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
-from langchain_core.messages import HumanMessage
-from sentence_transformers import SentenceTransformer
 
 from app.core.config import settings
+from app.services.chunking import create_text_splitter, load_pdf_chunks
+from app.services.embeddings import LocalEmbeddings
+from app.services.extractive import extractive_answer
+from app.services.generation import deadline_from_ms, generate_with_deadline, reserve_before
+from app.services.index_artifact import ArtifactError, IndexArtifact
+from app.services.llm_router import LLMRouter
+from app.services.metadata_index import MetadataIndex, build_where_filter, tags_to_metadata
+from app.services.pdf_parser import PDFParser
+from app.services.profiling import trace_span
+from app.services.prompts import build_direct_messages, build_rag_messages, extract_usage
+from app.services.tenant_pool import (
+    OWNER_METADATA_KEY,
+    TenantMetrics,
+    TenantPool,
+    TenantStore,
+    collection_name,
+    resolve_tenant_id,
+    tenant_owner,
+)
 from app.utils.file_handler import get_documents_from_directory
 
 
+# Failures that leave the current index in place when loading an artifact
+ARTIFACT_LOAD_ERRORS = (ArtifactError, OSError, ValueError, KeyError)
+
+# Error reported when a replacement PDF yields no chunks
+NO_TEXT_ERROR = "no text extracted"
+
+
 def strip_thinking_blocks(text: str) -> str:
     """
     Remove Claude thinking blocks from response.
@@ -31,23 +58,20 @@ def strip_thinking_blocks(text: str) -> str:
     return cleaned.strip()
 
 
-class LocalEmbeddings:
+def create_chroma_client():
     """
-    Local embeddings using SentenceTransformers.
-    Free alternative to OpenAI embeddings.
-    """
-
-    def __init__(self, model_name: str = None):
-        self.model_name = model_name or settings.embedding_model
-        self.model = SentenceTransformer(self.model_name)
+    Persistent Chroma client shared by every tenant collection.
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Embed a list of documents."""
-        return self.model.encode(texts, convert_to_numpy=True).tolist()
-
-    def embed_query(self, text: str) -> List[float]:
-        """Embed a query string."""
-        return self.model.encode([text], convert_to_numpy=True)[0].tolist()
+    With a segment cache budget, Chroma unloads the least recently used
+    collection indexes instead of keeping every opened one in memory.
+    """
+    cache_settings = {}
+    if settings.chroma_segment_cache_mb > 0:
+        cache_settings = {
+            "chroma_segment_cache_policy": "LRU",
+            "chroma_memory_limit_bytes": settings.chroma_segment_cache_mb * 1024 * 1024,
+        }
+    return chromadb.PersistentClient(path=settings.database_path, settings=ChromaSettings(**cache_settings))
 
 
 class RAGService:
@@ -56,8 +80,10 @@ class RAGService:
 
     Handles:
     - PDF document loading and chunking
-    - Vector storage with ChromaDB
+    - Vector storage with ChromaDB, one collection per tenant
     - RAG-enhanced chat with Claude
+
+    The embedding model, PDF parser and LLM router are shared by all tenants.
     """
 
     def __init__(self):
@@ -65,82 +91,173 @@ class RAGService:
         # Initialize local embeddings
         self.embeddings = LocalEmbeddings()
 
-        # Initialize vector store
-        self.vectorstore = Chroma(
-            persist_directory=settings.database_path,
-            embedding_function=self.embeddings,
-            collection_name="mili_documents"
+        # One Chroma client for every tenant's collection
+        self.chroma_client = create_chroma_client()
+
+        # Tenant collections are opened lazily into a bounded LRU pool
+        self.tenants = TenantPool(
+            self._open_tenant,
+            max_open=settings.tenant_max_open,
+            idle_seconds=settings.tenant_idle_seconds,
+            max_metrics=settings.tenant_metrics_max
         )
 
+        # Initialize PDF parser (fast backend, parallel page ranges, text cache)
+        self.pdf_parser = PDFParser()
+
         # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
+        self.text_splitter = create_text_splitter()
 
-        # Initialize LLM with custom endpoint
-        self.llm = ChatAnthropic(
-            model=settings.llm_model,
-            anthropic_api_key=settings.anthropic_api_key,
-            base_url=settings.anthropic_base_url,
-            temperature=0.7
-        )
+        # Initialize LLM router over the configured endpoint(s)
+        self.llm = LLMRouter.from_settings()
 
         # Simple chat history storage
         self.chat_history: Dict[str, List[Dict[str, str]]] = {}
 
-    async def ingest_pdf(self, pdf_path: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        # Prebuilt index artifact, served instead of Chroma for the default tenant when loaded
+        self.artifact: Optional[IndexArtifact] = None
+        if settings.index_artifact_path:
+            try:
+                artifact = self._open_index_artifact(settings.index_artifact_path)
+                result = self._swap_index_artifact(artifact)
+            except ARTIFACT_LOAD_ERRORS as e:
+                result = self._artifact_load_error(e)
+            print(f"Index artifact: {result['message']}")
+
+    def _open_tenant(self, tenant_id: str, create: bool) -> Optional[TenantStore]:
+        """
+        Open a tenant's collection and rebuild its metadata index.
+
+        Args:
+            tenant_id: Normalized tenant ID
+            create: Create the collection if it does not exist yet
+
+        Returns:
+            The tenant store, or None if the collection does not exist and create is False
+        """
+        name = collection_name(tenant_id)
+        if not create:
+            try:
+                self.chroma_client.get_collection(name)
+            except Exception:
+                # ValueError, or NotFoundError in newer Chroma releases
+                return None
+
+        vectorstore = Chroma(
+            client=self.chroma_client,
+            persist_directory=settings.database_path,
+            embedding_function=self.embeddings,
+            collection_name=name
+        )
+        # Secondary index over chunk source/page/tags, rebuilt from Chroma metadata
+        metadata_index = MetadataIndex()
+        self._rebuild_metadata_index(vectorstore._collection, metadata_index)
+        owner = (vectorstore._collection.metadata or {}).get(OWNER_METADATA_KEY)
+        return TenantStore(tenant_id, vectorstore, metadata_index, owner=owner)
+
+    @staticmethod
+    def _rebuild_metadata_index(collection, metadata_index: MetadataIndex, batch_size: int = 5000):
+        """Index the metadata of every chunk already in a Chroma collection."""
+        offset = 0
+        while True:
+            batch = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            for chunk_id, metadata in zip(batch["ids"], batch["metadatas"]):
+                metadata_index.add(chunk_id, metadata or {})
+            if len(batch["ids"]) < batch_size:
+                break
+            offset += batch_size
+
+    async def ingest_pdf(
+        self,
+        pdf_path: str,
+        metadata: Dict[str, Any] = None,
+        tags: Optional[List[str]] = None,
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Process PDF and store in vector database.
 
         Args:
             pdf_path: Path to PDF file
             metadata: Optional metadata to attach to documents
+            tags: Optional tags for scoped retrieval
+            tenant: Tenant whose collection receives the chunks (default tenant if None)
 
         Returns:
             Dictionary with ingestion results
+
+        Raises:
+            InvalidTenantError: If the tenant ID is invalid
         """
+        tenant_id = resolve_tenant_id(tenant)
         try:
-            # Load PDF
-            loader = PyPDFLoader(pdf_path)
-            documents = loader.load()
-
-            # Add metadata to documents
-            if metadata:
-                for doc in documents:
-                    doc.metadata.update(metadata)
-
-            # Split documents into chunks
-            splits = self.text_splitter.split_documents(documents)
-
-            # Add to vector store
-            self.vectorstore.add_documents(splits)
-
-            # Persist vector store
-            self.vectorstore.persist()
-
+            if tags:
+                metadata = {**(metadata or {}), **tags_to_metadata(tags)}
+
+            # Parse PDF and split into chunks, off the event loop so a large
+            # (possibly multi-process) parse does not stall concurrent chats
+            with trace_span("parse"):
+                parsed, splits = await asyncio.to_thread(
+                    load_pdf_chunks, self.pdf_parser, self.text_splitter, pdf_path, metadata
+                )
+
+            if splits:
+                # Embed chunks (also CPU-bound, so also off the event loop)
+                texts = [doc.page_content for doc in splits]
+                with trace_span("embed"):
+                    vectors = await asyncio.to_thread(self.embeddings.embed_documents, texts)
+
+                # Add to vector store and persist
+                ids = [str(uuid.uuid4()) for _ in splits]
+                store = await self.tenants.aget(tenant_id)
+                with trace_span("persist"):
+                    store.collection.upsert(
+                        ids=ids,
+                        embeddings=vectors,
+                        metadatas=[doc.metadata for doc in splits],
+                        documents=texts
+                    )
+                    store.vectorstore.persist()
+
+                for chunk_id, doc in zip(ids, splits):
+                    store.metadata_index.add(chunk_id, doc.metadata)
+
+            metrics = self._tenant_metrics(tenant_id)
+            if metrics is not None:
+                metrics.record_ingest(len(splits), ok=True)
             return {
                 "status": "success",
                 "message": f"Successfully ingested {len(splits)} chunks from {Path(pdf_path).name}",
                 "chunks": len(splits),
-                "source": Path(pdf_path).name
+                "source": Path(pdf_path).name,
+                "tenant": tenant_id,
+                "pages": parsed.page_count,
+                "pages_per_second": parsed.pages_per_second,
+                "parse_cached": parsed.cached,
+                "parser_backend": parsed.backend
             }
 
         except Exception as e:
+            metrics = self._tenant_metrics(tenant_id)
+            if metrics is not None:
+                metrics.record_ingest(0, ok=False)
             return {
                 "status": "error",
                 "message": f"Failed to ingest PDF: {str(e)}",
                 "error": str(e)
             }
 
-    async def ingest_from_directory(self, directory: str = "./data/documents") -> Dict[str, Any]:
+    async def ingest_from_directory(
+        self,
+        directory: str = "./data/documents",
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Ingest all PDFs from a directory.
 
         Args:
             directory: Path to documents directory
+            tenant: Tenant whose collection receives the chunks (default tenant if None)
 
         Returns:
             Dictionary with ingestion results
@@ -156,15 +273,18 @@ class RAGService:
 
         results = []
         total_chunks = 0
+        total_pages = 0
 
         for pdf_path in pdf_files:
             result = await self.ingest_pdf(
                 pdf_path,
-                metadata={"source": Path(pdf_path).name}
+                metadata={"source": Path(pdf_path).name},
+                tenant=tenant
             )
             results.append(result)
             if result["status"] == "success":
                 total_chunks += result.get("chunks", 0)
+                total_pages += result.get("pages", 0)
 
         successful = sum(1 for r in results if r["status"] == "success")
 
@@ -174,70 +294,122 @@ class RAGService:
             "ingested": successful,
             "total": len(pdf_files),
             "total_chunks": total_chunks,
+            "tenant": resolve_tenant_id(tenant),
+            "pages": total_pages,
             "details": results
         }
 
-    async def chat(self, query: str, session_id: str = "default") -> Dict[str, Any]:
+    async def chat(
+        self,
+        query: str,
+        session_id: str = "default",
+        filters: Optional[Dict[str, Any]] = None,
+        deadline_ms: Optional[int] = None,
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Chat with RAG-enhanced responses.
 
+        If the LLM has not produced a first token by the cutoff, or cannot
+        finish before the deadline, the answer is extracted locally from the
+        retrieved chunks instead (mode "extractive").
+
         Args:
             query: User query
             session_id: Session identifier for conversation memory
+            filters: Optional retrieval scope (sources, page_min, page_max, tags)
+            deadline_ms: End-to-end deadline (defaults to settings.chat_deadline_ms)
+            tenant: Tenant whose documents are searched (default tenant if None)
 
         Returns:
             Dictionary with response and metadata
+
+        Raises:
+            InvalidTenantError: If the tenant ID is invalid
         """
+        tenant_id = resolve_tenant_id(tenant)
+        start = time.perf_counter()
+        result = await self._chat(tenant_id, query, filters, deadline_ms)
+        metrics = self._tenant_metrics(tenant_id)
+        if metrics is not None:
+            metrics.record_chat(result["mode"], time.perf_counter() - start)
+        result["tenant"] = tenant_id
+        return result
+
+    def _tenant_metrics(self, tenant_id: str) -> Optional[TenantMetrics]:
+        """
+        Metrics for a tenant that exists, or None.
+
+        Only the default tenant, tenants open in the pool (which exist or
+        were just created by an ingest) and tenants already tracked get
+        metrics, so requests naming random tenant IDs cannot push real
+        tenants out of the bounded metrics table.
+        """
+        known = tenant_id == settings.default_tenant or tenant_id in self.tenants
+        return self.tenants.metrics(tenant_id, create=known)
+
+    async def _chat(
+        self,
+        tenant_id: str,
+        query: str,
+        filters: Optional[Dict[str, Any]],
+        deadline_ms: Optional[int]
+    ) -> Dict[str, Any]:
+        """Answer one query against a tenant's documents (see chat)."""
         try:
+            deadline = deadline_from_ms(settings.chat_deadline_ms if deadline_ms is None else deadline_ms)
+            first_token_timeout = (
+                settings.llm_first_token_timeout_ms / 1000 if settings.llm_first_token_timeout_ms > 0 else None
+            )
+
+            # Pin the active index and tenant store for the whole request (may be
+            # hot-swapped or evicted meanwhile); the artifact serves the default tenant only
+            artifact = self.artifact if tenant_id == settings.default_tenant else None
+            store = None if artifact is not None else await self.tenants.aget(tenant_id, create=False)
+            owner = tenant_owner(tenant_id, store)
+
             # Check if vector store has documents
-            collection = self.vectorstore._collection
-            doc_count = collection.count()
+            if artifact is not None:
+                doc_count = len(artifact)
+            elif store is not None:
+                doc_count = store.collection.count()
+            else:
+                doc_count = 0
 
             if doc_count == 0:
                 # Fallback to direct LLM call if no documents
-                response = await self.llm.ainvoke([
-                    HumanMessage(content=f"You are Mili, a helpful AI assistant for Tangzihan Xia's portfolio. Answer: {query}")
-                ])
+                with trace_span("llm"):
+                    response = await generate_with_deadline(
+                        self.llm, build_direct_messages(query, owner), first_token_timeout, deadline
+                    )
+                if response is None:
+                    return {
+                        "answer": "Sorry, I'm taking too long to respond right now. Please try again in a moment.",
+                        "sources": [],
+                        "document_count": 0,
+                        "mode": "timeout"
+                    }
                 return {
                     "answer": strip_thinking_blocks(response.content),
                     "sources": [],
                     "document_count": 0,
-                    "mode": "direct_llm"
+                    "mode": "direct_llm",
+                    "usage": extract_usage(response)
                 }
 
-            # Retrieve relevant documents
-            relevant_docs = await self.vectorstore.asimilarity_search(query, k=4)
-
-            # Create context from retrieved documents
-            context = "\n\n".join([doc.page_content for doc in relevant_docs])
-
-            # Build prompt with context
-            prompt = f"""
-                You are Mili, a helpful AI assistant for Tangzihan Xia's portfolio website.
-                Your role is to answer questions about Tangzihan's background, skills, projects, and work experience.
-
-                Use the following pieces of context to answer the question at the end.
-                If you don't know the answer based on the context, just say that you don't know.
-
-                Rules:
-                1. Keep your answers within 1-2 paragraphs unless user asks for more detail.
-                2. Try to use bullet points for clarity when listing information.
-                3. Try to end your responses with 1-2 follow-up questions that the user might find interesting.
-
-                Restrictions:
-                1. Do not make up answers that are not supported by facts and context.
-                2. Do not include your thought process in the final answer.
+            # Retrieve relevant documents (encoding is CPU-bound, so off the event loop)
+            with trace_span("embed"):
+                query_vector = await asyncio.to_thread(self.embeddings.embed_query, query)
+            relevant_docs = await self._retrieve(query_vector, k=4, artifact=artifact, store=store, filters=filters)
 
-                Context:
-                {context}
+            # Build cache-friendly messages: static system prompt, sorted context, question
+            messages = build_rag_messages(relevant_docs, query, owner)
 
-                Question: {query}
-
-                Helpful Answer:
-            """
-
-            # Generate response using LLM with context
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            # Generate response using LLM with context, stopping early enough
+            # for the extractive fallback to finish by the deadline
+            llm_deadline = reserve_before(deadline, settings.chat_fallback_reserve_ms / 1000)
+            with trace_span("llm"):
+                response = await generate_with_deadline(self.llm, messages, first_token_timeout, llm_deadline)
 
             # Extract source documents
             sources = [
@@ -248,11 +420,25 @@ class RAGService:
                 for doc in relevant_docs[:3]
             ]
 
+            if response is None:
+                # Upstream too slow: answer from the retrieved chunks instead
+                with trace_span("extractive"):
+                    answer = await asyncio.to_thread(
+                        extractive_answer, query_vector, relevant_docs, self.embeddings
+                    )
+                return {
+                    "answer": answer or "I couldn't find an answer to that in my documents.",
+                    "sources": sources,
+                    "document_count": doc_count,
+                    "mode": "extractive"
+                }
+
             return {
                 "answer": response.content,
                 "sources": sources,
                 "document_count": doc_count,
-                "mode": "rag"
+                "mode": "rag",
+                "usage": extract_usage(response)
             }
 
         except Exception as e:
@@ -263,14 +449,277 @@ class RAGService:
                 "mode": "error"
             }
 
-    def get_vector_store_stats(self) -> Dict[str, Any]:
-        """Get statistics about the vector store."""
+    async def _retrieve(
+        self,
+        query_vector: List[float],
+        k: int,
+        artifact: Optional[IndexArtifact],
+        store: Optional[TenantStore] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """
+        Retrieve the k most relevant chunks from the artifact or a tenant's collection.
+
+        Filters are first resolved against the metadata index; an empty
+        candidate set skips vector scoring entirely, and a small one is scored
+        exactly instead of searching the whole collection.
+        """
+        with trace_span("retrieve"):
+            if artifact is not None:
+                rows = artifact.metadata_index.candidates(**filters) if filters else None
+                return artifact.similarity_search_by_vector(query_vector, k=k, rows=rows)
+
+            candidates = store.metadata_index.candidates(**filters) if filters else None
+            if candidates is None:
+                return await store.vectorstore.asimilarity_search_by_vector(query_vector, k=k)
+            if not candidates:
+                return []
+            if len(candidates) <= settings.filtered_search_exact_max:
+                return self._search_candidates(store, query_vector, list(candidates), k)
+            return await store.vectorstore.asimilarity_search_by_vector(
+                query_vector, k=k, filter=build_where_filter(**filters)
+            )
+
+    @staticmethod
+    def _search_candidates(store: TenantStore, query_vector: List[float], ids: List[str], k: int) -> List[Document]:
+        """Exact search over a known set of chunk IDs (Chroma's L2 ranking)."""
+        batch = store.collection.get(ids=ids, include=["embeddings", "documents", "metadatas"])
+        if not len(batch["ids"]):
+            return []
+        vectors = np.asarray(batch["embeddings"], dtype=np.float32)
+        distances = np.linalg.norm(vectors - np.asarray(query_vector, dtype=np.float32), axis=1)
+        top = np.argsort(distances)[:k]
+        return [
+            Document(page_content=batch["documents"][i], metadata=batch["metadatas"][i] or {})
+            for i in top
+        ]
+
+    async def set_tenant_owner(self, tenant: Optional[str], owner: str) -> Dict[str, Any]:
+        """
+        Set the portfolio owner a tenant's assistant speaks for.
+
+        Stored in the tenant's collection metadata (creating the collection if
+        needed), so it survives restarts and pool eviction.
+
+        Args:
+            tenant: Tenant to update (default tenant if None)
+            owner: Owner name used in the tenant's system prompts
+
+        Returns:
+            Dictionary with update results
+        """
+        tenant_id = resolve_tenant_id(tenant)
+        try:
+            store = await self.tenants.aget(tenant_id)
+            # Chroma refuses changes to the index settings, so only pass the rest back
+            metadata = {
+                key: value for key, value in (store.collection.metadata or {}).items()
+                if not key.startswith("hnsw:")
+            }
+            metadata[OWNER_METADATA_KEY] = owner
+            store.collection.modify(metadata=metadata)
+            store.owner = owner
+
+            return {
+                "status": "success",
+                "message": f"Tenant {tenant_id} now answers for {owner}",
+                "tenant": tenant_id,
+                "owner": owner
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Failed to update tenant: {str(e)}",
+                "tenant": tenant_id,
+                "owner": tenant_owner(tenant_id, None),
+                "error": str(e)
+            }
+
+    async def list_documents(self, tenant: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List every source a tenant has ingested with chunk, page and tag counts."""
+        store = await self.tenants.aget(resolve_tenant_id(tenant), create=False)
+        return store.metadata_index.list_sources() if store is not None else []
+
+    async def delete_document(self, source: str, tenant: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Delete every chunk of one source from a tenant's vector store.
+
+        Args:
+            source: Source name as listed by list_documents()
+            tenant: Tenant owning the document (default tenant if None)
+
+        Returns:
+            Dictionary with deletion results
+        """
+        store = await self.tenants.aget(resolve_tenant_id(tenant), create=False)
+        ids = store.metadata_index.source_ids(source) if store is not None else set()
+        if not ids:
+            return {
+                "status": "error",
+                "message": f"No document with source {source}",
+                "source": source,
+                "deleted": 0
+            }
+
         try:
-            collection = self.vectorstore._collection
-            doc_count = collection.count()
+            with trace_span("persist"):
+                store.collection.delete(ids=list(ids))
+                store.vectorstore.persist()
+            store.metadata_index.remove_source(source)
+
+            return {
+                "status": "success",
+                "message": f"Deleted {len(ids)} chunks from {source}",
+                "source": source,
+                "deleted": len(ids)
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Failed to delete document: {str(e)}",
+                "source": source,
+                "deleted": 0,
+                "error": str(e)
+            }
+
+    async def replace_document(
+        self,
+        pdf_path: str,
+        source: str,
+        tags: Optional[List[str]] = None,
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Replace every chunk of one source with a new version of the PDF.
+
+        The new version is ingested before the old chunks are deleted, so the
+        source never disappears from retrieval mid-replace. A new version with
+        no extractable text is rejected and the old chunks are kept.
+
+        Args:
+            pdf_path: Path to the new PDF file
+            source: Source name to replace
+            tags: Optional tags for the new version
+            tenant: Tenant owning the document (default tenant if None)
+
+        Returns:
+            Dictionary with ingestion results
+        """
+        tenant_id = resolve_tenant_id(tenant)
+        store = await self.tenants.aget(tenant_id, create=False)
+        old_ids = store.metadata_index.source_ids(source) if store is not None else set()
+        result = await self.ingest_pdf(pdf_path, metadata={"source": source}, tags=tags, tenant=tenant_id)
+        if result["status"] == "success" and result["chunks"] == 0:
+            # e.g. a scanned PDF: replacing would silently empty the document
+            return {
+                "status": "error",
+                "message": f"New version of {source} has no extractable text; kept the previous version",
+                "source": source,
+                "tenant": tenant_id,
+                "chunks": 0,
+                "error": NO_TEXT_ERROR
+            }
+        if result["status"] != "success" or not old_ids:
+            return result
+
+        try:
+            store = await self.tenants.aget(tenant_id)
+            with trace_span("persist"):
+                store.collection.delete(ids=list(old_ids))
+                store.vectorstore.persist()
+            for chunk_id in old_ids:
+                store.metadata_index.remove(chunk_id)
+        except Exception as e:
+            result["status"] = "warning"
+            result["message"] += f", but failed to delete the previous version: {str(e)}"
+            return result
+
+        result["message"] = f"Replaced {len(old_ids)} chunks of {source} with {result['chunks']} new chunks"
+        return result
+
+    async def load_index_artifact(self, path: str, verify: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Load a prebuilt index artifact and atomically swap it in.
+
+        The new artifact is fully opened and validated in a worker thread
+        (verification hashes every file), then swapped in on the event loop,
+        so in-flight requests finish on the previous index and new requests
+        see only the new one.
+
+        Args:
+            path: Path to an artifact directory
+            verify: Verify checksums (defaults to settings.index_artifact_verify)
+
+        Returns:
+            Dictionary with load results
+        """
+        try:
+            artifact = await asyncio.to_thread(self._open_index_artifact, path, verify)
+        except ARTIFACT_LOAD_ERRORS as e:
+            return self._artifact_load_error(e)
+        return self._swap_index_artifact(artifact)
+
+    def _open_index_artifact(self, path: str, verify: Optional[bool] = None) -> IndexArtifact:
+        """Open, validate and index an artifact (blocking)."""
+        return IndexArtifact(
+            path,
+            verify=settings.index_artifact_verify if verify is None else verify,
+            embedding_model=self.embeddings.model_name
+        )
+
+    def _swap_index_artifact(self, artifact: IndexArtifact) -> Dict[str, Any]:
+        """Serve an opened artifact from now on."""
+        previous = self.artifact
+        self.artifact = artifact
+        return {
+            "status": "success",
+            "message": f"Loaded index artifact {artifact.version} with {len(artifact)} chunks",
+            "artifact": artifact.stats(),
+            "previous_version": previous.version if previous is not None else None
+        }
+
+    @staticmethod
+    def _artifact_load_error(e: Exception) -> Dict[str, Any]:
+        return {
+            "status": "error",
+            "message": f"Failed to load index artifact: {str(e)}",
+            "error": str(e)
+        }
+
+    def unload_index_artifact(self) -> Dict[str, Any]:
+        """Stop serving the artifact and fall back to the default tenant's Chroma collection."""
+        previous = self.artifact
+        self.artifact = None
+        return {
+            "status": "success",
+            "message": "Serving from Chroma vector store",
+            "previous_version": previous.version if previous is not None else None
+        }
+
+    async def get_vector_store_stats(self, tenant: Optional[str] = None) -> Dict[str, Any]:
+        """Get statistics about a tenant's vector store (default tenant if None)."""
+        try:
+            tenant_id = resolve_tenant_id(tenant)
+            artifact = self.artifact if tenant_id == settings.default_tenant else None
+            if artifact is not None:
+                return {
+                    "status": "healthy",
+                    "tenant": tenant_id,
+                    "document_count": len(artifact),
+                    "index_artifact": artifact.stats(),
+                    "embedding_model": self.embeddings.model_name
+                }
+
+            store = await self.tenants.aget(tenant_id, create=False)
+            doc_count = store.collection.count() if store is not None else 0
 
             return {
                 "status": "healthy",
+                "tenant": tenant_id,
+                "owner": tenant_owner(tenant_id, store),
+                "collection": collection_name(tenant_id),
                 "document_count": doc_count,
                 "persist_directory": settings.database_path,
                 "embedding_model": self.embeddings.model_name
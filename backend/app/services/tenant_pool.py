@@ -0,0 +1,318 @@
+"""
+Multi-tenant vector stores with a bounded pool of open collections.
+
+Each tenant owns one Chroma collection in the shared database. Opening a
+tenant wraps its collection and rebuilds its metadata index; open tenants are
+kept in an LRU pool of at most ``tenant_max_open`` entries and closed after
+``tenant_idle_seconds`` without use, so memory is bounded by the pool size
+rather than the number of tenants. The embedding model, PDF parser and LLM
+clients are shared by every tenant.
+
+Opening reads every chunk's metadata, so async callers use ``aget``, which
+opens in a worker thread and lets concurrent misses for one tenant share a
+single open.
+"""
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.metadata_index import MetadataIndex
+
+
+DEFAULT_COLLECTION = "mili_documents"
+TENANT_COLLECTION_PREFIX = "mili_tenant_"
+# Collection metadata key holding the portfolio owner named in the tenant's prompts
+OWNER_METADATA_KEY = "owner"
+
+# Lowercase, 1-48 chars, so "mili_tenant_<id>" is a valid Chroma collection name
+_TENANT_ID_PATTERN = re.compile(r"^[a-z0-9](?:[a-z0-9_-]{0,46}[a-z0-9])?$")
+
+
+class InvalidTenantError(ValueError):
+    """Raised for tenant IDs that cannot name a collection."""
+
+
+def resolve_tenant_id(tenant: Optional[str]) -> str:
+    """
+    Normalize a tenant ID from a request, falling back to the default tenant.
+
+    Raises:
+        InvalidTenantError: If the ID is not 1-48 lowercase letters, digits, '-' or '_'
+    """
+    tenant = (tenant or "").strip().lower()
+    if not tenant:
+        return settings.default_tenant
+    if not _TENANT_ID_PATTERN.match(tenant):
+        raise InvalidTenantError(
+            f"Invalid tenant ID '{tenant}': use 1-48 letters, digits, '-' or '_', "
+            "starting and ending with a letter or digit"
+        )
+    return tenant
+
+
+def collection_name(tenant_id: str) -> str:
+    """Chroma collection holding a tenant's chunks; the default tenant keeps the original name."""
+    if tenant_id == settings.default_tenant:
+        return DEFAULT_COLLECTION
+    return f"{TENANT_COLLECTION_PREFIX}{tenant_id}"
+
+
+class TenantStore:
+    """Open vector store, metadata index and persona for one tenant."""
+
+    def __init__(
+        self,
+        tenant_id: str,
+        vectorstore: Any,
+        metadata_index: MetadataIndex,
+        owner: Optional[str] = None
+    ):
+        self.tenant_id = tenant_id
+        self.vectorstore = vectorstore
+        self.metadata_index = metadata_index
+        self.owner = owner
+        self.opened_at = time.monotonic()
+        self.last_used = self.opened_at
+
+    @property
+    def collection(self) -> Any:
+        return self.vectorstore._collection
+
+
+def tenant_owner(tenant_id: str, store: Optional[TenantStore]) -> Optional[str]:
+    """
+    Portfolio owner the tenant's assistant speaks for.
+
+    Stored in the tenant's collection metadata; the default tenant falls back
+    to settings.default_tenant_owner, other tenants to a neutral persona (None).
+    """
+    if store is not None and store.owner:
+        return store.owner
+    if tenant_id == settings.default_tenant:
+        return settings.default_tenant_owner or None
+    return None
+
+
+class TenantMetrics:
+    """Request counters for one tenant."""
+
+    __slots__ = (
+        "chats", "chat_errors", "chat_seconds", "modes",
+        "ingests", "ingest_errors", "chunks_ingested", "opens", "last_active"
+    )
+
+    def __init__(self):
+        self.chats = 0
+        self.chat_errors = 0
+        self.chat_seconds = 0.0
+        self.modes: Dict[str, int] = {}
+        self.ingests = 0
+        self.ingest_errors = 0
+        self.chunks_ingested = 0
+        self.opens = 0
+        self.last_active = 0.0
+
+    def record_chat(self, mode: str, seconds: float):
+        self.chats += 1
+        self.chat_seconds += seconds
+        self.modes[mode] = self.modes.get(mode, 0) + 1
+        if mode == "error":
+            self.chat_errors += 1
+        self.last_active = time.time()
+
+    def record_ingest(self, chunks: int, ok: bool):
+        self.ingests += 1
+        self.chunks_ingested += chunks
+        if not ok:
+            self.ingest_errors += 1
+        self.last_active = time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "chats": self.chats,
+            "chat_errors": self.chat_errors,
+            "avg_chat_ms": round(self.chat_seconds / self.chats * 1000, 1) if self.chats else None,
+            "modes": dict(self.modes),
+            "ingests": self.ingests,
+            "ingest_errors": self.ingest_errors,
+            "chunks_ingested": self.chunks_ingested,
+            "opens": self.opens,
+            "last_active": self.last_active or None,
+        }
+
+
+class TenantPool:
+    """
+    LRU pool of open tenant stores plus bounded per-tenant metrics.
+
+    Stores are opened lazily by ``opener(tenant_id, create)``, which returns
+    None for a tenant with no collection when ``create`` is False, so reads
+    for unknown tenants never create collections. Eviction only drops the
+    pool's reference: a request that already holds a store finishes on it.
+    """
+
+    def __init__(
+        self,
+        opener: Callable[[str, bool], Optional[TenantStore]],
+        max_open: int = 64,
+        idle_seconds: float = 600.0,
+        max_metrics: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._opener = opener
+        self.max_open = max(1, max_open)
+        self.idle_seconds = idle_seconds
+        self.max_metrics = max(1, max_metrics)
+        self._clock = clock
+        self._stores: "OrderedDict[str, TenantStore]" = OrderedDict()
+        self._metrics: "OrderedDict[str, TenantMetrics]" = OrderedDict()
+        # In-flight opens started by aget(), keyed by (tenant_id, create)
+        self._opening: Dict[Tuple[str, bool], "asyncio.Future[Optional[TenantStore]]"] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.idle_closes = 0
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._stores
+
+    def get(self, tenant_id: str, create: bool = True) -> Optional[TenantStore]:
+        """
+        Return the tenant's store, opening it (and evicting the least recently used) if needed.
+
+        Args:
+            tenant_id: Normalized tenant ID
+            create: Create the tenant's collection if it does not exist
+
+        Returns:
+            The tenant store, or None if the tenant has no collection and create is False
+        """
+        store = self._lookup(tenant_id)
+        if store is None:
+            store = self._opener(tenant_id, create)
+            if store is None:
+                return None
+            self._add(tenant_id, store)
+        return store
+
+    async def aget(self, tenant_id: str, create: bool = True) -> Optional[TenantStore]:
+        """
+        Like get(), but opens a missing store in a worker thread.
+
+        Concurrent misses for the same tenant wait for one open instead of
+        each rebuilding the tenant's metadata index.
+        """
+        store = self._lookup(tenant_id)
+        if store is not None:
+            return store
+
+        key = (tenant_id, create)
+        opening = self._opening.get(key)
+        if opening is None:
+            opening = asyncio.ensure_future(asyncio.to_thread(self._opener, tenant_id, create))
+            self._opening[key] = opening
+            opening.add_done_callback(lambda _: self._opening.pop(key, None))
+        # Shielded: a cancelled request must not cancel an open others wait for
+        store = await asyncio.shield(opening)
+        if store is None:
+            return None
+
+        # The first waiter to resume adds the store; the others find it
+        current = self._lookup(tenant_id)
+        if current is not None:
+            return current
+        self._add(tenant_id, store)
+        return store
+
+    def _lookup(self, tenant_id: str) -> Optional[TenantStore]:
+        """Return an open store and mark it used, or None on a miss."""
+        now = self._clock()
+        self.close_idle(now)
+        store = self._stores.get(tenant_id)
+        if store is not None:
+            self.hits += 1
+            self._stores.move_to_end(tenant_id)
+            store.last_used = now
+        return store
+
+    def _add(self, tenant_id: str, store: TenantStore):
+        """Add a newly opened store, evicting the least recently used past max_open."""
+        self.misses += 1
+        self.metrics(tenant_id).opens += 1
+        store.last_used = self._clock()
+        self._stores[tenant_id] = store
+        while len(self._stores) > self.max_open:
+            self._stores.popitem(last=False)
+            self.evictions += 1
+
+    def close_idle(self, now: Optional[float] = None) -> int:
+        """
+        Close stores unused for idle_seconds.
+
+        The pool is ordered by last use, so only the stale head is visited.
+
+        Returns:
+            Number of stores closed
+        """
+        if self.idle_seconds <= 0:
+            return 0
+        now = self._clock() if now is None else now
+        closed = 0
+        while self._stores:
+            tenant_id, store = next(iter(self._stores.items()))
+            if now - store.last_used < self.idle_seconds:
+                break
+            del self._stores[tenant_id]
+            closed += 1
+        self.idle_closes += closed
+        return closed
+
+    def close(self, tenant_id: str) -> bool:
+        """Drop one tenant's store from the pool."""
+        return self._stores.pop(tenant_id, None) is not None
+
+    def metrics(self, tenant_id: str, create: bool = True) -> Optional[TenantMetrics]:
+        """
+        Metrics for a tenant; the least recently active tenant is forgotten past max_metrics.
+
+        Returns None if the tenant has no metrics yet and create is False.
+        """
+        metrics = self._metrics.get(tenant_id)
+        if metrics is None:
+            if not create:
+                return None
+            metrics = self._metrics[tenant_id] = TenantMetrics()
+            while len(self._metrics) > self.max_metrics:
+                self._metrics.popitem(last=False)
+        else:
+            self._metrics.move_to_end(tenant_id)
+        return metrics
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy and hit rate (no tenant names)."""
+        lookups = self.hits + self.misses
+        return {
+            "open": len(self._stores),
+            "max_open": self.max_open,
+            "idle_seconds": self.idle_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "idle_closes": self.idle_closes,
+            "tracked_tenants": len(self._metrics),
+        }
+
+    def tenant_stats(self) -> List[Dict[str, Any]]:
+        """Per-tenant metrics, most recently active first."""
+        return [
+            {"tenant": tenant_id, "open": tenant_id in self._stores, **metrics.stats()}
+            for tenant_id, metrics in reversed(self._metrics.items())
+        ]
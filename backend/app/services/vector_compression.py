@@ -0,0 +1,155 @@
+"""
+Compact embedding storage for index artifacts.
+
+Vectors can be reduced in dimension (PCA fitted at build time, or Matryoshka-
+style truncation to the leading dimensions) and stored as float16 or int8
+with per-dimension scales. Compact vectors only rank candidates; the top
+candidates are rescored against the full-precision vectors, which stay on
+disk and are only paged in for those few rows.
+"""
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+COMPRESSION_MODES = ("float16", "int8")
+REDUCTION_METHODS = ("pca", "truncate")
+COMPRESSOR_NAME = "compressor.npz"
+COMPACT_EMBEDDINGS_NAME = "embeddings_compact.npy"
+
+# Rows converted to float32 at a time while scoring; small enough to stay in cache
+SCORE_BLOCK_ROWS = 1024
+# Vectors sampled to fit PCA and quantization scales
+FIT_SAMPLE_ROWS = 50000
+
+
+class VectorCompressor:
+    """Dimensionality reduction plus scalar quantization of embeddings."""
+
+    def __init__(self, mode: str = "int8", dims: Optional[int] = None, method: str = "pca"):
+        if mode not in COMPRESSION_MODES:
+            raise ValueError(f"Unknown compression mode '{mode}' (expected one of {COMPRESSION_MODES})")
+        if method not in REDUCTION_METHODS:
+            raise ValueError(f"Unknown reduction method '{method}' (expected one of {REDUCTION_METHODS})")
+        self.mode = mode
+        self.dims = dims or None
+        self.method = method
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None  # (dimension, dims) for PCA
+        self.scale: Optional[np.ndarray] = None  # per-dimension int8 scale
+
+    @property
+    def output_dims(self) -> int:
+        return self.scale.shape[0] if self.scale is not None else self.dims
+
+    def fit(self, vectors: np.ndarray) -> "VectorCompressor":
+        """Fit the projection and quantization scales on a sample of vectors."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) > FIT_SAMPLE_ROWS:
+            sample = np.random.default_rng(0).choice(len(vectors), FIT_SAMPLE_ROWS, replace=False)
+            vectors = vectors[np.sort(sample)]
+        dimension = vectors.shape[1]
+        if self.dims is not None and self.dims >= dimension:
+            self.dims = None
+
+        if self.dims is not None and self.method == "pca":
+            self.mean = vectors.mean(axis=0)
+            # Right singular vectors of the centred data are the principal axes
+            _, _, vt = np.linalg.svd(vectors - self.mean, full_matrices=False)
+            self.components = np.ascontiguousarray(vt[:self.dims].T, dtype=np.float32)
+
+        projected = self.project(vectors)
+        if self.mode == "int8":
+            scale = np.abs(projected).max(axis=0) / 127.0
+            scale[scale == 0] = 1.0
+            self.scale = scale.astype(np.float32)
+        else:
+            self.scale = np.ones(projected.shape[1], dtype=np.float32)
+        return self
+
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        """Reduce vectors to the compact dimensionality (float32)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dims is None:
+            return vectors
+        if self.method == "truncate":
+            return vectors[..., :self.dims]
+        return (vectors - self.mean) @ self.components
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Compress vectors for storage."""
+        projected = self.project(vectors)
+        if self.mode == "float16":
+            return projected.astype(np.float16)
+        return np.clip(np.rint(projected / self.scale), -127, 127).astype(np.int8)
+
+    def prepare_query(self, query: np.ndarray) -> np.ndarray:
+        """
+        Project a query so that ``compact @ prepared`` ranks like ``full @ query``.
+
+        For PCA the mean offset adds the same constant to every score, so it
+        is dropped; int8 scales are folded into the query.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if self.dims is not None:
+            query = query[:self.dims] if self.method == "truncate" else query @ self.components
+        return query * self.scale
+
+    def scores(self, compact: np.ndarray, prepared_query: np.ndarray) -> np.ndarray:
+        """
+        Approximate similarity of every compact row to a prepared query.
+
+        numpy has no BLAS kernel for float16 or int8, so rows are converted to
+        float32 block by block. That conversion costs more than a float32 matmul
+        over the same rows, so this is only faster than full-precision search
+        once the rows are reduced (int8 + PCA); otherwise it only saves memory.
+        """
+        out = np.empty(len(compact), dtype=np.float32)
+        for start in range(0, len(compact), SCORE_BLOCK_ROWS):
+            block = np.asarray(compact[start:start + SCORE_BLOCK_ROWS], dtype=np.float32)
+            out[start:start + len(block)] = block @ prepared_query
+        return out
+
+    def params(self) -> Dict[str, Any]:
+        """Manifest description of this compressor."""
+        return {"mode": self.mode, "dims": self.output_dims, "method": self.method if self.dims else None}
+
+    def save(self, directory: Path):
+        arrays = {"scale": self.scale}
+        if self.components is not None:
+            arrays.update(mean=self.mean, components=self.components)
+        np.savez(Path(directory) / COMPRESSOR_NAME, **arrays)
+
+    @classmethod
+    def load(cls, directory: Path, params: Dict[str, Any]) -> "VectorCompressor":
+        reduced = params.get("method") is not None
+        compressor = cls(
+            mode=params["mode"],
+            dims=params["dims"] if reduced else None,
+            method=params.get("method") or "pca"
+        )
+        with np.load(Path(directory) / COMPRESSOR_NAME) as arrays:
+            compressor.scale = arrays["scale"]
+            if "components" in arrays:
+                compressor.mean = arrays["mean"]
+                compressor.components = arrays["components"]
+        return compressor
+
+
+def rescore_top_k(
+    full: np.ndarray,
+    query: np.ndarray,
+    candidate_rows: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact top-k among candidate rows using full-precision vectors.
+
+    Returns:
+        Tuple of (rows, scores), best first
+    """
+    rows = np.sort(candidate_rows)  # sequential access into the memory map
+    exact = np.asarray(full[rows], dtype=np.float32) @ query
+    order = np.argsort(-exact)[:k]
+    return rows[order], exact[order]
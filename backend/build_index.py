@@ -0,0 +1,62 @@
+"""
+Offline index artifact builder for Mili AI Assistant.
+
+Usage (from backend directory):
+    python build_index.py build --documents ./data/documents --output ./artifacts
+    python build_index.py build --compact int8 --dims 128   # compact search vectors
+    python build_index.py verify ./artifacts/index-<version>
+
+Point INDEX_ARTIFACT_PATH at the printed directory to serve it at startup,
+or hot-swap a running server with POST /api/index/load.
+"""
+import argparse
+import json
+import sys
+
+from app.services.index_artifact import ArtifactError, build_artifact, verify_artifact
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build and verify Mili index artifacts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Build an artifact from a directory of PDFs")
+    build.add_argument("--documents", default="./data/documents", help="Directory of PDFs to index")
+    build.add_argument("--output", default="./artifacts", help="Directory to write the artifact into")
+    build.add_argument("--compact", choices=["float16", "int8"], help="Store compact vectors for search")
+    build.add_argument("--dims", type=int, help="Reduce compact vectors to this many dimensions")
+    build.add_argument("--reduce", choices=["pca", "truncate"], default="pca",
+                       help="Dimensionality reduction: PCA, or truncation for Matryoshka models")
+    build.add_argument("--memory-only", action="store_true",
+                       help="Allow compact modes that save memory but search slower than float32")
+
+    verify = subparsers.add_parser("verify", help="Verify an artifact's checksums")
+    verify.add_argument("path", help="Path to an artifact directory")
+
+    args = parser.parse_args()
+
+    if args.command == "build" and args.compact and not args.memory_only:
+        # numpy has no fast float16 or int8 matmul: every query converts the compact
+        # rows to float32, which only pays off once PCA/truncation shrinks them
+        if args.dims is None:
+            parser.error("--compact without --dims saves memory but makes search slower than float32; "
+                         "add --dims (e.g. --dims 128), or pass --memory-only to accept slower search")
+        if args.compact == "float16":
+            parser.error("float16 compact vectors search slower than float32 even with --dims; "
+                         "use --compact int8, or pass --memory-only to accept slower search")
+
+    try:
+        if args.command == "build":
+            result = build_artifact(args.documents, args.output, args.compact, args.dims, args.reduce)
+            print(json.dumps(result, indent=2))
+        else:
+            manifest = verify_artifact(args.path)
+            print(f"OK: {manifest['version']} ({manifest['count']} chunks, {manifest['embedding_model']})")
+    except ArtifactError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
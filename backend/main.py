@@ -1,10 +1,12 @@
 """
 FastAPI application for Mili AI Assistant.
 """
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.routes import chat, ingest, health
+from app.api.routes import chat, ingest, health, index, admin, documents
+from app.services.profiling import request_profiler
 
 # Create FastAPI app
 app = FastAPI(
@@ -22,10 +24,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Trace, profile and slow-log requests when enabled; otherwise pass through."""
+    if not request_profiler.tracing_enabled:
+        return await call_next(request)
+
+    profile = request_profiler.should_profile(request.headers)
+    trace, sampler, token = request_profiler.start(request.method, request.url.path, profile)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        record = request_profiler.finish(trace, sampler, token, status_code)
+
+    response.headers["X-Request-ID"] = trace.request_id
+    if sampler is not None:
+        # Profile files are written off the event loop
+        response.headers["X-Profile-ID"] = await asyncio.to_thread(request_profiler.write_profile, record, sampler)
+    return response
+
+
 # Include routers
 app.include_router(chat.router)
 app.include_router(ingest.router)
 app.include_router(health.router)
+app.include_router(documents.router)
+app.include_router(index.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
@@ -39,6 +67,10 @@ async def root():
             "chat": "/api/chat",
             "ingest": "/api/ingest",
             "ingest_directory": "/api/ingest-directory",
+            "documents": "/api/documents",
+            "index": "/api/index",
+            "profiles": "/api/admin/profiles",
+            "tenants": "/api/admin/tenants",
             "health": "/api/health"
         }
     }
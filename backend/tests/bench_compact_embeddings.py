@@ -0,0 +1,157 @@
+"""
+Compact Embedding Benchmark for Mili AI Assistant
+=================================================
+Usage:
+1. From backend directory: python -m tests.bench_compact_embeddings [--sizes 20000 100000]
+2. Compares full float32 brute-force search against float16 / int8 / PCA /
+   truncated compact vectors (with full-precision rescoring) on synthetic
+   corpora and, when sentence-transformers is installed, on the bundled
+   documents in data/documents. Reports memory, search speedup and recall@k.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Settings require an API key; the benchmark never calls the LLM
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from app.services.index_artifact import normalize_rows  # noqa: E402
+from app.services.vector_compression import VectorCompressor, rescore_top_k  # noqa: E402
+
+CONFIGS = [
+    ("float16", None, "pca"),
+    ("int8", None, "pca"),
+    ("int8", 128, "pca"),
+    ("int8", 64, "pca"),
+    ("float16", 128, "truncate"),
+]
+
+
+def synthetic_corpus(n: int, dimension: int = 384, latent: int = 48, seed: int = 0):
+    """Low-rank, clustered unit vectors resembling sentence embeddings."""
+    rng = np.random.default_rng(seed)
+    basis = rng.normal(size=(latent, dimension)).astype(np.float32)
+    centers = rng.normal(size=(max(n // 100, 8), latent)).astype(np.float32)
+    assignment = rng.integers(0, len(centers), size=n)
+    latent_points = centers[assignment] + 0.6 * rng.normal(size=(n, latent)).astype(np.float32)
+    vectors = latent_points @ basis + 0.3 * rng.normal(size=(n, dimension)).astype(np.float32)
+    queries = centers[rng.integers(0, len(centers), size=200)] @ basis
+    queries += 0.8 * rng.normal(size=queries.shape).astype(np.float32)
+    return normalize_rows(vectors), normalize_rows(queries)
+
+
+def bundled_corpus():
+    """Embeddings of the bundled PDFs, or None if the embedding model is unavailable."""
+    try:
+        from app.services.chunking import create_text_splitter, load_pdf_chunks
+        from app.services.embeddings import LocalEmbeddings
+        from app.services.pdf_parser import PDFParser
+        from app.utils.file_handler import get_documents_from_directory
+    except ImportError as e:
+        print(f"\nSkipping bundled corpus: {e}")
+        return None
+
+    documents_dir = Path(__file__).parent.parent / "data" / "documents"
+    parser, splitter = PDFParser(cache_dir=""), create_text_splitter()
+    texts = []
+    for pdf_path in get_documents_from_directory(str(documents_dir)):
+        _, chunks = load_pdf_chunks(parser, splitter, pdf_path)
+        texts.extend(chunk.page_content for chunk in chunks)
+    if not texts:
+        return None
+
+    embedder = LocalEmbeddings()
+    vectors = normalize_rows(np.asarray(embedder.embed_documents(texts), dtype=np.float32))
+    queries = normalize_rows(np.asarray(embedder.embed_documents([
+        "work experience", "education", "programming languages", "projects", "teaching",
+        "internship", "skills", "awards", "leadership", "research",
+    ]), dtype=np.float32))
+    return vectors, queries
+
+
+def exact_top_k(vectors, query, k):
+    scores = vectors @ query
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def timed(fn, queries):
+    results, timings = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(fn(query))
+        timings.append(time.perf_counter() - start)
+    return results, float(np.median(timings)) * 1000
+
+
+def run(name: str, vectors: np.ndarray, queries: np.ndarray, k: int, rescore_factor: int):
+    k = min(k, len(vectors))
+    print(f"\n{'='*78}")
+    print(f" {name}: {len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries, recall@{k}")
+    print(f"{'='*78}")
+    exact, baseline_ms = timed(lambda q: exact_top_k(vectors, q, k), queries)
+    print(f"{'float32 (baseline)':<24} {vectors.nbytes / 1e6:>9.2f} MB   1.00x mem  {baseline_ms:>7.2f} ms         recall 1.000")
+
+    for mode, dims, method in CONFIGS:
+        if dims is not None and dims >= vectors.shape[1]:
+            continue
+        compressor = VectorCompressor(mode, dims, method).fit(vectors)
+        compact = compressor.encode(vectors)
+        n_candidates = min(k * rescore_factor, len(vectors))
+
+        def approx_only(query):
+            scores = compressor.scores(compact, compressor.prepare_query(query))
+            return exact_top_k_scores(scores, k)
+
+        def with_rescore(query):
+            scores = compressor.scores(compact, compressor.prepare_query(query))
+            candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+            return rescore_top_k(vectors, query, candidates, k)[0]
+
+        approx, _ = timed(approx_only, queries)
+        rescored, search_ms = timed(with_rescore, queries)
+        label = f"{mode}" + (f" + {method} {dims}" if dims else "")
+        print(
+            f"{label:<24} {compact.nbytes / 1e6:>9.2f} MB  {vectors.nbytes / compact.nbytes:>5.2f}x mem  "
+            f"{search_ms:>7.2f} ms ({baseline_ms / search_ms:>4.2f}x)  "
+            f"recall {recall(exact, rescored):.3f} (no rescore {recall(exact, approx):.3f})"
+        )
+
+
+def exact_top_k_scores(scores, k):
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def recall(exact, found) -> float:
+    return float(np.mean([len(set(e) & set(f)) / len(e) for e, f in zip(exact, found)]))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark compact embedding storage")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 100000])
+    arg_parser.add_argument("--k", type=int, default=10)
+    arg_parser.add_argument("--rescore-factor", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    print("\n" + "=" * 78)
+    print(" Mili Compact Embedding Benchmark")
+    print("=" * 78)
+    print("Memory is the search-time vector footprint; full-precision rows stay on disk for rescoring.")
+
+    corpus = bundled_corpus()
+    if corpus is not None:
+        run("Bundled documents", corpus[0], corpus[1], args.k, args.rescore_factor)
+
+    for size in args.sizes:
+        vectors, queries = synthetic_corpus(size)
+        run(f"Synthetic {size}", vectors, queries, args.k, args.rescore_factor)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+PDF Parser Benchmark for Mili AI Assistant
+==========================================
+Usage:
+1. From backend directory: python -m tests.bench_pdf_parser [--pages 300 500]
+2. Generates synthetic multi-hundred-page PDFs and reports pages/second for
+   every installed backend: sequential, parallel page ranges, and cache hits.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+# Settings require an API key; the benchmark never calls the LLM
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from app.services.pdf_parser import BACKEND_PREFERENCE, PDFParser, backend_available  # noqa: E402
+
+WORDS = (
+    "portfolio project engineering research python typescript retrieval vector "
+    "embedding latency throughput design system distributed cache model intern"
+).split()
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_synthetic_pdf(path: Path, pages: int, lines_per_page: int = 45, seed: int = 0):
+    """Write a minimal valid text PDF with the given number of pages."""
+    rng = random.Random(seed)
+    objects = []  # object bodies, 1-indexed by position
+
+    # 1: catalog, 2: pages tree, 3: font; page/content objects follow
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(b"")  # pages tree placeholder
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page in range(pages):
+        lines = [f"Page {page + 1}"] + [
+            " ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines_per_page)
+        ]
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        ops += [f"({_escape(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    path.write_bytes(bytes(out))
+
+
+def run_case(pdf_path: Path, backend: str, workers: int, cache_dir: str) -> dict:
+    parser = PDFParser(backend=backend, workers=workers, parallel_min_pages=1, cache_dir=cache_dir)
+    try:
+        if workers > 1:
+            # Warm the process pool like a long-running server would
+            parser._extract(str(pdf_path))
+        cold = parser.parse(str(pdf_path))
+        warm = parser.parse(str(pdf_path)) if cache_dir else None
+    finally:
+        parser.shutdown()
+    return {"cold": cold, "warm": warm}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark PDF parsing backends")
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[200, 500])
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = arg_parser.parse_args()
+
+    backends = [b for b in BACKEND_PREFERENCE if backend_available(b)]
+    print("\n" + "=" * 60)
+    print(" Mili PDF Parser Benchmark")
+    print("=" * 60)
+    print(f"Installed backends: {', '.join(backends) or 'none'}")
+    print(f"Workers: {args.workers}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        for pages in args.pages:
+            pdf_path = tmp_path / f"synthetic-{pages}.pdf"
+            start = time.perf_counter()
+            write_synthetic_pdf(pdf_path, pages)
+            print(f"\n{'='*60}")
+            print(f" {pages} pages ({pdf_path.stat().st_size / 1e6:.1f} MB, generated in {time.perf_counter() - start:.2f}s)")
+            print(f"{'='*60}")
+
+            for backend in backends:
+                sequential = run_case(pdf_path, backend, workers=1, cache_dir="")
+                parallel = run_case(pdf_path, backend, args.workers, cache_dir=str(tmp_path / f"cache-{backend}-{pages}"))
+                print(
+                    f"{backend:<8} sequential: {sequential['cold'].pages_per_second:>9.1f} pages/s | "
+                    f"parallel: {parallel['cold'].pages_per_second:>9.1f} pages/s | "
+                    f"cached: {parallel['warm'].pages_per_second:>10.1f} pages/s"
+                )
+    print()
+
+
+if __name__ == "__main__":
+    main()
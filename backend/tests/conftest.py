@@ -0,0 +1,32 @@
+"""
+Shared pytest setup and fixtures.
+
+Run from backend directory: python -m pytest tests/
+"""
+
+import os
+
+import pytest
+
+from tests.fake_documents import BagOfWordsEmbeddings
+
+# Settings require an API key at import time; tests only talk to local fakes
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """RAGService on a temporary Chroma database with a bag-of-words embedder."""
+    for module in ("chromadb", "langchain_community", "sentence_transformers"):
+        pytest.importorskip(module)
+    from app.core.config import settings
+    # Importing the module also builds the global instance
+    from app.services import rag_service as rag_module
+
+    monkeypatch.setattr(settings, "database_path", str(tmp_path / "chroma_db"))
+    monkeypatch.setattr(settings, "pdf_cache_dir", "")
+    monkeypatch.setattr(settings, "index_artifact_path", "")
+    monkeypatch.setattr(rag_module, "LocalEmbeddings", BagOfWordsEmbeddings)
+    service = rag_module.RAGService()
+    yield service
+    service.pdf_parser.shutdown()
@@ -0,0 +1,204 @@
+"""
+Local fake of the Anthropic Messages API for tests and benchmarks.
+
+Records every request it receives, simulates prompt caching from the
+request's cache_control breakpoints (ignoring prefixes shorter than
+``min_cache_tokens``, as Anthropic does), and can be made slow or failing to
+exercise deadlines and endpoint routing.
+
+Usage:
+    with FakeAnthropicServer(first_token_delay=0.5) as server:
+        llm = ChatAnthropic(model="fake", anthropic_api_key="test", base_url=server.base_url)
+        ...
+        server.requests[-1]["body"]
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count (4 characters per token) of a JSON-serializable value."""
+    return max(1, len(json.dumps(value, sort_keys=True)) // 4)
+
+
+def cache_prefixes(body: Dict[str, Any]) -> List[str]:
+    """
+    Serialized prompt prefixes ending at each cache_control breakpoint.
+
+    Follows Anthropic's prefix order: tools, then system, then messages.
+    """
+    blocks: List[Any] = list(body.get("tools") or [])
+    system = body.get("system")
+    if isinstance(system, str):
+        blocks.append({"type": "text", "text": system})
+    elif system:
+        blocks.extend(system)
+    for message in body.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            blocks.append({"role": message["role"], "type": "text", "text": content})
+        else:
+            blocks.extend({"role": message["role"], **block} for block in content)
+
+    prefixes = []
+    for i, block in enumerate(blocks):
+        if isinstance(block, dict) and block.get("cache_control"):
+            stripped = [
+                {k: v for k, v in b.items() if k != "cache_control"} if isinstance(b, dict) else b
+                for b in blocks[: i + 1]
+            ]
+            prefixes.append(json.dumps(stripped, sort_keys=True))
+    return prefixes
+
+
+class FakeAnthropicServer:
+    """Threaded HTTP server speaking enough of /v1/messages for ChatAnthropic."""
+
+    def __init__(
+        self,
+        reply: str = "Hello from the fake upstream.",
+        first_token_delay: float = 0.0,
+        token_delay: float = 0.0,
+        fail_status: Optional[int] = None,
+        min_cache_tokens: int = 1024,
+    ):
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.fail_status = fail_status
+        self.min_cache_tokens = min_cache_tokens
+        self.requests: List[Dict[str, Any]] = []
+        self._cached: set = set()
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("content-length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests.append({"path": self.path, "headers": dict(self.headers), "body": body})
+                try:
+                    fake._respond(self, body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client gave up (deadline or hedge cancellation)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def usage_for(self, body: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Simulate prompt caching: the longest previously seen prefix is a cache read.
+
+        Breakpoints ending a prefix shorter than min_cache_tokens are ignored.
+        """
+        total = estimate_tokens({"system": body.get("system"), "messages": body.get("messages")})
+        prefixes = [
+            p for p in cache_prefixes(body)
+            if estimate_tokens(json.loads(p)) >= self.min_cache_tokens
+        ]
+        with self._lock:
+            hit = next((p for p in reversed(prefixes) if p in self._cached), None)
+            cache_read = estimate_tokens(json.loads(hit)) if hit else 0
+            cache_creation = 0
+            if prefixes and prefixes[-1] != hit:
+                cache_creation = max(estimate_tokens(json.loads(prefixes[-1])) - cache_read, 0)
+            self._cached.update(prefixes)
+        return {
+            "input_tokens": max(total - cache_read - cache_creation, 0),
+            "cache_read_input_tokens": cache_read,
+            "cache_creation_input_tokens": cache_creation,
+            "output_tokens": estimate_tokens(self.reply),
+        }
+
+    def _respond(self, handler: BaseHTTPRequestHandler, body: Dict[str, Any]):
+        time.sleep(self.first_token_delay)
+
+        if self.fail_status is not None:
+            payload = json.dumps({
+                "type": "error",
+                "error": {"type": "api_error", "message": "fake upstream failure"},
+            }).encode()
+            handler.send_response(self.fail_status)
+            handler.send_header("content-type", "application/json")
+            handler.send_header("content-length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+            return
+
+        usage = self.usage_for(body)
+        message = {
+            "id": f"msg_fake_{len(self.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [{"type": "text", "text": self.reply}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+        if not body.get("stream"):
+            payload = json.dumps(message).encode()
+            handler.send_response(200)
+            handler.send_header("content-type", "application/json")
+            handler.send_header("content-length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+            return
+
+        handler.send_response(200)
+        handler.send_header("content-type", "text/event-stream")
+        handler.send_header("cache-control", "no-cache")
+        handler.end_headers()
+
+        def send(event: str, data: Dict[str, Any]):
+            handler.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+            handler.wfile.flush()
+
+        start = dict(message, content=[], stop_reason=None, usage=dict(usage, output_tokens=1))
+        send("message_start", {"type": "message_start", "message": start})
+        send("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        for i, word in enumerate(self.reply.split(" ")):
+            if i and self.token_delay:
+                time.sleep(self.token_delay)
+            text = word if i == 0 else f" {word}"
+            send("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}})
+        send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        send("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": usage["output_tokens"]},
+        })
+        send("message_stop", {"type": "message_stop"})
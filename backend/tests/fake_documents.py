@@ -0,0 +1,68 @@
+"""
+Small local stand-ins for documents and the embedding model in tests.
+
+Usage:
+    write_text_pdf(tmp_path / "resume.pdf", ["Page one text.", "Page two text."])
+    embeddings = BagOfWordsEmbeddings()
+"""
+
+import re
+from pathlib import Path
+from typing import List, Union
+
+
+def _pdf_string(text: str) -> str:
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def write_text_pdf(path: Union[str, Path], pages: List[str]) -> str:
+    """
+    Write a minimal PDF with one line of Helvetica text per page.
+
+    Returns:
+        The path as a string
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 10 Tf 20 750 Td {_pdf_string(text)} Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    Path(path).write_bytes(bytes(out))
+    return str(path)
+
+
+class BagOfWordsEmbeddings:
+    """Tiny deterministic stand-in for the sentence transformer."""
+
+    VOCAB = ["intern", "kiroku", "teaching", "assistant", "nus", "workshop", "agentic", "hobby"]
+
+    def __init__(self, model_name: str = "bag-of-words"):
+        self.model_name = model_name
+
+    def _embed(self, text):
+        words = re.findall(r"[a-z]+", text.lower())
+        # Constant last term: no text embeds to the zero vector
+        return [float(words.count(term)) for term in self.VOCAB] + [1.0]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
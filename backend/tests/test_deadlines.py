@@ -0,0 +1,154 @@
+"""
+Deadline and extractive fallback tests against a slow local fake LLM, for the
+generation helpers and for RAGService.chat end to end.
+
+Run from backend directory: python -m pytest tests/test_deadlines.py
+"""
+
+import asyncio
+import time
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage
+
+from app.core.config import settings
+from app.services.extractive import extractive_answer, split_sentences
+from app.services.generation import deadline_from_ms, generate_with_deadline, remaining_seconds, reserve_before
+from tests.fake_anthropic import FakeAnthropicServer
+from tests.fake_documents import BagOfWordsEmbeddings, write_text_pdf
+
+
+def _llm(server):
+    return ChatAnthropic(model="fake-model", anthropic_api_key="test", base_url=server.base_url, max_retries=0)
+
+
+def _generate(server, first_token_timeout, deadline_ms):
+    async def run():
+        return await generate_with_deadline(
+            _llm(server), [HumanMessage(content="hi")], first_token_timeout, deadline_from_ms(deadline_ms)
+        )
+    start = time.perf_counter()
+    response = asyncio.run(run())
+    return response, time.perf_counter() - start
+
+
+def test_fast_upstream_answers_in_full():
+    with FakeAnthropicServer(reply="Hello there friend") as server:
+        response, _ = _generate(server, first_token_timeout=2.0, deadline_ms=5000)
+    assert response is not None
+    assert response.content == "Hello there friend"
+
+
+def test_slow_first_token_gives_up_at_cutoff():
+    with FakeAnthropicServer(first_token_delay=2.0) as server:
+        response, elapsed = _generate(server, first_token_timeout=0.3, deadline_ms=10000)
+    assert response is None
+    assert elapsed < 1.5
+
+
+def test_deadline_caps_a_slow_stream():
+    with FakeAnthropicServer(reply="one two three four five six", token_delay=0.3) as server:
+        response, elapsed = _generate(server, first_token_timeout=2.0, deadline_ms=500)
+    assert response is None
+    assert elapsed < 1.5
+
+
+def test_fallback_reserve_shortens_the_llm_deadline():
+    async def run():
+        deadline = deadline_from_ms(2000)
+        return (
+            remaining_seconds(reserve_before(deadline, 0.5)),
+            remaining_seconds(reserve_before(deadline_from_ms(400), 0.5)),
+            reserve_before(None, 0.5),
+            reserve_before(deadline, 0) == deadline,
+        )
+
+    reserved, short, unbounded, disabled = asyncio.run(run())
+    assert 1.4 < reserved <= 1.5
+    # Never more than half of the remaining time
+    assert 0.15 < short <= 0.2
+    assert unbounded is None and disabled
+
+
+def test_extractive_answer_picks_query_sentences_in_order():
+    docs = [
+        Document(page_content="Tangzihan was a software engineering intern at Kiroku. He enjoys hiking on weekends."),
+        Document(page_content="- Teaching assistant for CS1010S at NUS for two semesters\n- Ran an agentic AI workshop"),
+    ]
+    embeddings = BagOfWordsEmbeddings()
+    answer = extractive_answer(embeddings.embed_query("Where was he an intern at Kiroku?"), docs, embeddings, max_sentences=1)
+    assert answer == "Tangzihan was a software engineering intern at Kiroku."
+
+    answer = extractive_answer(embeddings.embed_query("teaching assistant at NUS, kiroku intern"), docs, embeddings, max_sentences=2)
+    assert answer.startswith("Tangzihan was a software engineering intern")
+    assert answer.endswith("Teaching assistant for CS1010S at NUS for two semesters")
+
+
+def test_split_sentences_drops_fragments_and_bullets():
+    text = "EXPERIENCE\n\n• Built a RAG assistant with FastAPI.\n• Led a team of four engineers. Shipped weekly."
+    assert split_sentences(text) == ["Built a RAG assistant with FastAPI.", "Led a team of four engineers."]
+
+
+def _chat(service, server, query, **kwargs):
+    service.llm = _llm(server)
+    start = time.perf_counter()
+    result = asyncio.run(service.chat(query, **kwargs))
+    return result, time.perf_counter() - start
+
+
+def _ingest_resume(service, tmp_path):
+    pdf = write_text_pdf(tmp_path / "resume.pdf", [
+        "Tangzihan was a software engineering intern at Kiroku. He enjoys hiking on weekends.",
+        "He was a teaching assistant for CS1010S at NUS for two semesters.",
+    ])
+    assert asyncio.run(service.ingest_pdf(pdf, metadata={"source": "resume.pdf"}))["status"] == "success"
+
+
+def test_chat_answers_extractively_when_the_first_token_is_late(service, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "llm_first_token_timeout_ms", 300)
+    _ingest_resume(service, tmp_path)
+
+    with FakeAnthropicServer(first_token_delay=3.0) as server:
+        result, elapsed = _chat(service, server, "Where was he an intern at Kiroku?", deadline_ms=10000)
+
+    assert result["mode"] == "extractive"
+    assert "intern at Kiroku" in result["answer"]
+    assert result["sources"] and result["document_count"] == 2
+    assert elapsed < 2.0
+
+
+def test_chat_fallback_finishes_within_the_deadline(service, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "llm_first_token_timeout_ms", 0)
+    monkeypatch.setattr(settings, "chat_fallback_reserve_ms", 300)
+    _ingest_resume(service, tmp_path)
+
+    with FakeAnthropicServer(reply="one two three four five", token_delay=0.5) as server:
+        result, elapsed = _chat(service, server, "teaching assistant at NUS", deadline_ms=1000)
+
+    assert result["mode"] == "extractive"
+    assert "teaching assistant" in result["answer"]
+    # The LLM gives up early enough for the fallback to fit in the deadline
+    assert elapsed < 1.0
+
+
+def test_chat_without_documents_times_out(service, monkeypatch):
+    monkeypatch.setattr(settings, "llm_first_token_timeout_ms", 300)
+
+    with FakeAnthropicServer(first_token_delay=3.0) as server:
+        result, elapsed = _chat(service, server, "Hello?", deadline_ms=10000)
+
+    assert result["mode"] == "timeout"
+    assert result["document_count"] == 0 and result["sources"] == []
+    assert elapsed < 2.0
+
+
+def test_chat_answers_with_the_llm_when_it_is_fast(service, tmp_path):
+    _ingest_resume(service, tmp_path)
+
+    with FakeAnthropicServer(reply="He interned at Kiroku.") as server:
+        result, _ = _chat(service, server, "Where did he intern?", deadline_ms=5000)
+        body = server.requests[-1]["body"]
+
+    assert result["mode"] == "rag" and result["answer"] == "He interned at Kiroku."
+    assert "intern at Kiroku" in body["messages"][0]["content"][0]["text"]
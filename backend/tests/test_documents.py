@@ -0,0 +1,122 @@
+"""
+Document management tests against a temporary Chroma collection: scoped retrieval
+(exact scoring and where pushdown), delete and replace by source.
+
+Run from backend directory: python -m pytest tests/test_documents.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from tests.fake_documents import write_text_pdf
+
+
+# Distinct word counts per page, so no two chunks tie on distance
+RESUME_PAGES = [
+    "Software engineering intern at Kiroku. Intern projects shipped weekly.",
+    "Teaching assistant at NUS for two semesters. Teaching tutorials and grading.",
+    "Intern again at Kiroku working on search. Teaching new interns the codebase.",
+]
+PROJECT_PAGES = [
+    "Ran an agentic AI workshop. The workshop covered agentic tools and agentic evaluation.",
+    "Hobby projects include a workshop timer. Hobby hardware builds.",
+]
+QUERIES = ["Where did he intern at Kiroku?", "teaching assistant at NUS", "agentic workshop hobby"]
+FILTERS = [
+    {"sources": ["resume.pdf"]},
+    {"sources": ["projects.pdf"]},
+    {"sources": ["resume.pdf", "projects.pdf"], "page_min": 1},
+    {"tags": ["cv"]},
+    {"sources": ["resume.pdf"], "tags": ["cv"], "page_max": 1},
+    {"page_min": 2, "page_max": 2},
+]
+
+
+def _ingest(service, tmp_path, name, pages, tags=None):
+    pdf = write_text_pdf(tmp_path / name, pages)
+    result = asyncio.run(service.ingest_pdf(pdf, metadata={"source": name}, tags=tags))
+    assert result["status"] == "success", result
+    return result
+
+
+def _retrieve(service, query, filters, k=3):
+    async def run():
+        store = await service.tenants.aget(settings.default_tenant, create=False)
+        vector = service.embeddings.embed_query(query)
+        return await service._retrieve(vector, k=k, artifact=None, store=store, filters=filters)
+
+    return [(doc.metadata["source"], doc.metadata["page"]) for doc in asyncio.run(run())]
+
+
+def _collection_sources(service):
+    store = asyncio.run(service.tenants.aget(settings.default_tenant, create=False))
+    metadatas = store.collection.get(include=["metadatas"])["metadatas"]
+    return sorted((m["source"], m["page"]) for m in metadatas)
+
+
+@pytest.fixture
+def corpus(service, tmp_path):
+    _ingest(service, tmp_path, "resume.pdf", RESUME_PAGES, tags=["cv"])
+    _ingest(service, tmp_path, "projects.pdf", PROJECT_PAGES)
+    return service
+
+
+def test_exact_scoring_and_where_pushdown_agree(corpus, monkeypatch):
+    for filters in FILTERS:
+        for query in QUERIES:
+            monkeypatch.setattr(settings, "filtered_search_exact_max", 10_000)
+            exact = _retrieve(corpus, query, filters)
+            monkeypatch.setattr(settings, "filtered_search_exact_max", 0)
+            pushed_down = _retrieve(corpus, query, filters)
+
+            assert exact == pushed_down, (filters, query)
+            assert exact, (filters, query)
+            if "sources" in filters:
+                assert {source for source, _ in exact} <= set(filters["sources"])
+            if "tags" in filters:
+                assert {source for source, _ in exact} == {"resume.pdf"}
+
+    # Filters with no candidates skip vector search entirely
+    assert _retrieve(corpus, QUERIES[0], {"sources": ["missing.pdf"]}) == []
+
+
+def test_delete_document_updates_chroma_and_the_index(corpus):
+    result = asyncio.run(corpus.delete_document("resume.pdf"))
+
+    assert result["status"] == "success" and result["deleted"] == 3
+    assert _collection_sources(corpus) == [("projects.pdf", 0), ("projects.pdf", 1)]
+    assert [d["source"] for d in asyncio.run(corpus.list_documents())] == ["projects.pdf"]
+    assert _retrieve(corpus, QUERIES[0], {"tags": ["cv"]}) == []
+    assert {source for source, _ in _retrieve(corpus, QUERIES[0], None)} == {"projects.pdf"}
+
+    again = asyncio.run(corpus.delete_document("resume.pdf"))
+    assert again["status"] == "error" and again["deleted"] == 0
+
+
+def test_replace_document_swaps_chunks_in_chroma_and_the_index(corpus, tmp_path):
+    new_version = write_text_pdf(tmp_path / "resume-v2.pdf", ["Teaching assistant at NUS, now head tutor."])
+    result = asyncio.run(corpus.replace_document(new_version, source="resume.pdf", tags=["cv", "2025"]))
+
+    assert result["status"] == "success" and result["chunks"] == 1
+    assert "Replaced 3 chunks" in result["message"]
+    assert _collection_sources(corpus) == [("projects.pdf", 0), ("projects.pdf", 1), ("resume.pdf", 0)]
+
+    documents = {d["source"]: d for d in asyncio.run(corpus.list_documents())}
+    assert documents["resume.pdf"]["chunks"] == 1
+    assert sorted(documents["resume.pdf"]["tags"]) == ["2025", "cv"]
+    assert _retrieve(corpus, "teaching", {"tags": ["2025"]}) == [("resume.pdf", 0)]
+    assert _retrieve(corpus, "teaching", {"sources": ["resume.pdf"], "page_min": 1}) == []
+
+
+def test_replace_with_no_text_keeps_the_previous_version(corpus, tmp_path):
+    before = _collection_sources(corpus)
+    blank = write_text_pdf(tmp_path / "scanned.pdf", ["", ""])
+    result = asyncio.run(corpus.replace_document(blank, source="resume.pdf"))
+
+    assert result["status"] == "error" and result["chunks"] == 0
+    assert "kept the previous version" in result["message"]
+    assert _collection_sources(corpus) == before
+    documents = {d["source"]: d for d in asyncio.run(corpus.list_documents())}
+    assert documents["resume.pdf"]["chunks"] == 3
@@ -0,0 +1,124 @@
+"""
+Index artifact tests: write/load/search round trip, checksum verification and model compatibility.
+
+Run from backend directory: python -m pytest tests/test_index_artifact.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from app.services.index_artifact import (
+    TEXTS_NAME,
+    ArtifactError,
+    IndexArtifact,
+    verify_artifact,
+    write_artifact,
+)
+from app.services.vector_compression import VectorCompressor
+
+
+MODEL = "test-model"
+
+
+def _corpus(n=50, dimension=32):
+    rng = np.random.default_rng(0)
+    docs = [
+        Document(page_content=f"Chunk {i} — ünïcode text", metadata={"source": f"doc{i % 3}.pdf", "page": i})
+        for i in range(n)
+    ]
+    return docs, rng.normal(size=(n, dimension)).astype(np.float32)
+
+
+def test_round_trip_write_load_search(tmp_path):
+    docs, vectors = _corpus()
+    path = write_artifact(str(tmp_path), docs, vectors, MODEL, extra_manifest={"chunk_size": 1000})
+
+    assert path.name.startswith("index-")
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]  # no temporary directory left behind
+
+    artifact = IndexArtifact(str(path), verify=True, embedding_model=MODEL)
+    assert (len(artifact), artifact.dimension, artifact.embedding_model) == (50, 32, MODEL)
+    assert artifact.manifest["chunk_size"] == 1000
+    assert artifact.manifest["sources"] == ["doc0.pdf", "doc1.pdf", "doc2.pdf"]
+    assert artifact.stats()["version"] == artifact.version
+
+    for i in (0, 17, 49):
+        (row, score), *rest = artifact.search(vectors[i], k=3)
+        assert row == i and score == pytest.approx(1.0, abs=1e-5)
+        assert len(rest) == 2 and rest[0][1] >= rest[1][1]
+
+    doc = artifact.similarity_search_by_vector(vectors[17].tolist(), k=1)[0]
+    assert doc.page_content == docs[17].page_content
+    assert doc.metadata == docs[17].metadata
+
+
+def test_round_trip_with_compact_vectors(tmp_path):
+    docs, vectors = _corpus()
+    path = write_artifact(str(tmp_path), docs, vectors, MODEL, compressor=VectorCompressor("int8", dims=16))
+    artifact = IndexArtifact(str(path), verify=True)
+
+    assert artifact.manifest["compression"] == {"mode": "int8", "dims": 16, "method": "pca"}
+    for i in (0, 17, 49):
+        # Rescoring at full precision recovers the exact match
+        row, score = artifact.search(vectors[i], k=1)[0]
+        assert row == i and score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_tampered_artifact_fails_verification(tmp_path):
+    docs, vectors = _corpus()
+    path = write_artifact(str(tmp_path), docs, vectors, MODEL)
+    verify_artifact(str(path))
+
+    # Same size, different content: only the checksum can tell
+    texts = path / TEXTS_NAME
+    data = bytearray(texts.read_bytes())
+    data[0] ^= 0xFF
+    texts.write_bytes(bytes(data))
+
+    with pytest.raises(ArtifactError, match="Checksum mismatch"):
+        verify_artifact(str(path))
+    with pytest.raises(ArtifactError):
+        IndexArtifact(str(path), verify=True)
+
+    # Truncation is caught on every load, even without verification
+    texts.write_bytes(bytes(data[:-1]))
+    with pytest.raises(ArtifactError, match="missing or truncated"):
+        IndexArtifact(str(path))
+
+
+def test_mismatched_embedding_model_is_rejected(tmp_path):
+    docs, vectors = _corpus()
+    path = write_artifact(str(tmp_path), docs, vectors, "other-model")
+    with pytest.raises(ArtifactError, match="other-model"):
+        IndexArtifact(str(path), embedding_model=MODEL)
+
+
+def test_load_index_artifact_rejects_mismatched_model_and_keeps_serving(tmp_path):
+    # Importing the service builds the global instance (Chroma and the embedding model)
+    pytest.importorskip("chromadb")
+    pytest.importorskip("langchain_community")
+    pytest.importorskip("sentence_transformers")
+    from app.services.rag_service import RAGService
+
+    docs, vectors = _corpus()
+    good = write_artifact(str(tmp_path / "good"), docs, vectors, MODEL)
+    bad = write_artifact(str(tmp_path / "bad"), docs, vectors, "other-model")
+
+    # Only the attributes load_index_artifact touches; avoids opening Chroma or the embedder
+    service = RAGService.__new__(RAGService)
+    service.embeddings = SimpleNamespace(model_name=MODEL)
+    service.artifact = None
+
+    assert asyncio.run(service.load_index_artifact(str(good)))["status"] == "success"
+    active = service.artifact
+    # Built during the load, not on the first scoped query
+    assert active.metadata_index.candidates(sources=["doc1.pdf"]) == set(range(1, 50, 3))
+
+    result = asyncio.run(service.load_index_artifact(str(bad)))
+    assert result["status"] == "error"
+    assert "other-model" in result["message"]
+    assert service.artifact is active
@@ -0,0 +1,127 @@
+"""
+LLM routing tests against several local fake upstreams with different latency profiles.
+
+Run from backend directory: python -m pytest tests/test_llm_router.py
+"""
+
+import asyncio
+import random
+import time
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import HumanMessage
+
+from app.core.config import settings
+from app.services.generation import deadline_from_ms, generate_with_deadline
+from app.services.llm_router import Endpoint, LLMRouter, NoHealthyEndpointError
+from tests.fake_anthropic import FakeAnthropicServer
+
+
+MESSAGES = [HumanMessage(content="hi")]
+
+
+def _endpoint(name, server, weight=1.0):
+    client = ChatAnthropic(model="fake-model", anthropic_api_key="test", base_url=server.base_url, max_retries=0)
+    return Endpoint(name, client, server.base_url, "fake-model", weight=weight)
+
+
+def _ask(router):
+    start = time.perf_counter()
+    response = asyncio.run(router.ainvoke(MESSAGES))
+    return response, time.perf_counter() - start
+
+
+def test_hedge_wins_against_slow_primary(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_initial_delay_ms", 100)
+    with FakeAnthropicServer(reply="slow", first_token_delay=1.5) as slow, \
+            FakeAnthropicServer(reply="fast") as fast:
+        # Weights make the slow endpoint the primary; the fast one is only a hedge
+        router = LLMRouter([_endpoint("slow", slow, weight=1e6), _endpoint("fast", fast, weight=1e-6)], hedge=True)
+        response, elapsed = _ask(router)
+
+        assert response.content == "fast"
+        assert elapsed < 1.0
+        assert len(slow.requests) == 1 and len(fast.requests) == 1
+
+    stats = {s["name"]: s for s in router.stats()}
+    assert stats["slow"]["in_flight"] == 0
+    # Losing a hedge race is not a failure
+    assert stats["slow"]["failures"] == 0 and stats["slow"]["circuit"] == "closed"
+    # The cancelled loser still records a (lower-bound) latency sample
+    assert stats["slow"]["latency_ewma_ms"] >= 100
+
+
+def test_no_hedge_waits_for_primary():
+    with FakeAnthropicServer(reply="slow", first_token_delay=0.5) as slow, \
+            FakeAnthropicServer(reply="fast") as fast:
+        router = LLMRouter([_endpoint("slow", slow, weight=1e6), _endpoint("fast", fast, weight=1e-6)], hedge=False)
+        response, _ = _ask(router)
+        assert response.content == "slow"
+        assert len(fast.requests) == 0
+
+
+def test_failing_endpoint_fails_over_and_is_ejected(monkeypatch):
+    monkeypatch.setattr(settings, "llm_circuit_failures", 2)
+    with FakeAnthropicServer(fail_status=500) as broken, FakeAnthropicServer(reply="ok") as healthy:
+        broken_endpoint = _endpoint("broken", broken, weight=1e6)
+        router = LLMRouter([broken_endpoint, _endpoint("healthy", healthy)], rng=random.Random(0))
+
+        for _ in range(2):
+            response, _ = _ask(router)
+            assert response.content == "ok"
+        assert len(broken.requests) == 2
+        assert broken_endpoint.stats()["circuit"] == "open"
+
+        # Ejected: traffic no longer reaches it despite its weight
+        for _ in range(3):
+            _ask(router)
+        assert len(broken.requests) == 2
+        assert len(healthy.requests) == 5
+
+
+def test_selection_prefers_faster_endpoint():
+    with FakeAnthropicServer(first_token_delay=0.2) as slow, FakeAnthropicServer() as fast:
+        slow_endpoint, fast_endpoint = _endpoint("slow", slow), _endpoint("fast", fast)
+        slow_endpoint.record_success(0.2)
+        fast_endpoint.record_success(0.01)
+        router = LLMRouter([slow_endpoint, fast_endpoint], rng=random.Random(1))
+
+        picks = [router.select().name for _ in range(200)]
+        assert picks.count("fast") > 150
+
+
+def test_all_endpoints_failing_raises():
+    with FakeAnthropicServer(fail_status=503) as first, FakeAnthropicServer(fail_status=500) as second:
+        router = LLMRouter([_endpoint("first", first), _endpoint("second", second)])
+        try:
+            _ask(router)
+        except NoHealthyEndpointError:
+            pass
+        else:
+            raise AssertionError("expected NoHealthyEndpointError")
+        assert len(first.requests) == 1 and len(second.requests) == 1
+
+
+def test_hung_endpoint_is_ejected_after_first_token_cutoffs(monkeypatch):
+    monkeypatch.setattr(settings, "llm_circuit_failures", 2)
+
+    def generate(router):
+        async def run():
+            return await generate_with_deadline(router, MESSAGES, 0.2, deadline_from_ms(5000))
+        return asyncio.run(run())
+
+    # Accepts the connection but never streams within the cutoff
+    with FakeAnthropicServer(first_token_delay=3.0) as hung, FakeAnthropicServer(reply="ok") as healthy:
+        hung_endpoint = _endpoint("hung", hung, weight=1e6)
+        router = LLMRouter([hung_endpoint, _endpoint("healthy", healthy)], hedge=False, rng=random.Random(0))
+
+        for _ in range(2):
+            assert generate(router) is None  # extractive fallback territory
+        stats = hung_endpoint.stats()
+        assert stats["failures"] == 2 and stats["circuit"] == "open"
+        assert stats["in_flight"] == 0
+
+        # Ejected: the next request goes to the healthy endpoint despite the weights
+        response = generate(router)
+        assert response is not None and response.content == "ok"
+        assert len(hung.requests) == 2
@@ -0,0 +1,125 @@
+"""
+Metadata index tests: tag encoding, filter resolution, Chroma where clauses and scoped artifact search.
+
+Run from backend directory: python -m pytest tests/test_metadata_index.py
+"""
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.services.index_artifact import IndexArtifact, write_artifact
+from app.services.metadata_index import (
+    MetadataIndex,
+    build_where_filter,
+    metadata_tags,
+    tags_to_metadata,
+)
+from app.services.vector_compression import VectorCompressor
+
+
+CHUNKS = {
+    "c1": {"source": "resume.pdf", "page": 0, **tags_to_metadata(["cv"])},
+    "c2": {"source": "resume.pdf", "page": 1, **tags_to_metadata(["cv", "2024"])},
+    "c3": {"source": "projects.pdf", "page": 1, **tags_to_metadata(["2024"])},
+    "c4": {"source": "projects.pdf", "page": 3},
+    "c5": {"source": "notes.pdf"},
+}
+
+
+def _index():
+    index = MetadataIndex()
+    for chunk_id, metadata in CHUNKS.items():
+        index.add(chunk_id, metadata)
+    return index
+
+
+def test_tags_round_trip_through_metadata():
+    metadata = tags_to_metadata([" cv", "resume", "", "cv"])
+    assert metadata == {"tags": "cv,resume", "tag:cv": True, "tag:resume": True}
+    assert sorted(metadata_tags({"source": "a.pdf", **metadata})) == ["cv", "resume"]
+    assert tags_to_metadata(["", "  "]) == {}
+    assert metadata_tags({"tag:old": False}) == []
+
+
+def test_no_filter_matches_everything():
+    index = _index()
+    assert index.candidates() is None
+    assert index.candidates(sources=[], tags=[]) is None
+
+
+def test_sources_are_ored_and_tags_are_anded():
+    index = _index()
+    assert index.candidates(sources=["resume.pdf", "notes.pdf"]) == {"c1", "c2", "c5"}
+    assert index.candidates(tags=["cv"]) == {"c1", "c2"}
+    assert index.candidates(tags=["cv", "2024"]) == {"c2"}
+    assert index.candidates(sources=["projects.pdf"], tags=["2024"]) == {"c3"}
+
+
+def test_open_ended_page_ranges_are_inclusive():
+    index = _index()
+    assert index.candidates(page_min=1) == {"c2", "c3", "c4"}
+    assert index.candidates(page_max=1) == {"c1", "c2", "c3"}
+    assert index.candidates(page_min=1, page_max=1) == {"c2", "c3"}
+    # Chunks without a page never match a page filter
+    assert "c5" not in index.candidates(page_min=0)
+
+
+def test_filters_with_no_matches_return_an_empty_set():
+    index = _index()
+    assert index.candidates(sources=["missing.pdf"]) == set()
+    assert index.candidates(tags=["cv", "unknown"]) == set()
+    assert index.candidates(page_min=5) == set()
+    assert index.candidates(page_min=2, page_max=1) == set()
+    assert index.candidates(sources=["notes.pdf"], tags=["cv"]) == set()
+
+
+def test_remove_and_readd_update_every_index():
+    index = _index()
+    assert index.remove_source("resume.pdf") == {"c1", "c2"}
+    assert index.candidates(tags=["cv"]) == set()
+    assert "cv" not in index.by_tag and 0 not in index.by_page
+    assert len(index) == 3
+
+    # Re-adding an ID replaces its previous entry
+    index.add("c3", {"source": "projects.pdf", "page": 2})
+    assert index.candidates(tags=["2024"]) == set()
+    assert index.candidates(page_min=2, page_max=2) == {"c3"}
+    assert [s["source"] for s in index.list_sources()] == ["notes.pdf", "projects.pdf"]
+    assert index.list_sources()[1] == {"source": "projects.pdf", "chunks": 2, "pages": 2, "tags": []}
+
+
+def test_build_where_filter():
+    assert build_where_filter() is None
+    assert build_where_filter(sources=["a.pdf"]) == {"source": {"$in": ["a.pdf"]}}
+    assert build_where_filter(sources=["a.pdf"], page_min=1, page_max=3, tags=["cv"]) == {"$and": [
+        {"source": {"$in": ["a.pdf"]}},
+        {"page": {"$gte": 1}},
+        {"page": {"$lte": 3}},
+        {"tag:cv": True},
+    ]}
+
+
+def _write_artifact(directory, compressor=None):
+    docs = [Document(page_content=chunk_id, metadata=metadata) for chunk_id, metadata in CHUNKS.items()]
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(len(docs), 16)).astype(np.float32)
+    path = write_artifact(str(directory), docs, vectors, "test-model", compressor=compressor)
+    return IndexArtifact(str(path)), vectors
+
+
+def test_artifact_search_is_restricted_to_candidate_rows(tmp_path):
+    for compressor in (None, VectorCompressor("int8")):
+        artifact, vectors = _write_artifact(tmp_path / str(compressor is not None), compressor)
+        rows = artifact.metadata_index.candidates(sources=["projects.pdf", "notes.pdf"])
+        assert rows == {2, 3, 4}
+
+        # The query is closest to row 0, which is outside the candidate rows
+        results = artifact.search(vectors[0], k=2, rows=rows)
+        assert len(results) == 2
+        assert {row for row, _ in results} <= rows
+        assert results[0][1] >= results[1][1]
+
+        assert artifact.search(vectors[0], k=4, rows=set()) == []
+        assert [row for row, _ in artifact.search(vectors[3], k=10, rows={3})] == [3]
+        docs = artifact.similarity_search_by_vector(vectors[4], k=1, rows=rows)
+        assert docs[0].page_content == "c5"
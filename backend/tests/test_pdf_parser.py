@@ -0,0 +1,130 @@
+"""
+PDF parser tests: parallel page ranges, worker crashes, parsed-text cache hits and pruning.
+
+Run from backend directory: python -m pytest tests/test_pdf_parser.py
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from app.services.pdf_parser import PDFParser, split_page_ranges
+from tests.fake_documents import write_text_pdf
+
+pypdf = pytest.importorskip("pypdf")
+
+
+def _write_pdf(path, title):
+    # Blank pages; the title makes each file's content hash distinct
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(width=200, height=200)
+    writer.add_metadata({"/Title": title})
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+def _parser(cache_dir, max_entries):
+    return PDFParser(backend="pypdf", workers=1, cache_dir=str(cache_dir), cache_max_entries=max_entries)
+
+
+def test_split_page_ranges_covers_every_page_once():
+    assert split_page_ranges(0, 4, 8) == []
+    assert split_page_ranges(5, 4, 8) == [(0, 5)]
+    assert split_page_ranges(150, 4, 8) == [(0, 19), (19, 38), (38, 57), (57, 76), (76, 95),
+                                            (95, 114), (114, 133), (133, 150)]
+    for page_count, workers in ((1, 1), (63, 2), (64, 3), (1000, 16)):
+        ranges = split_page_ranges(page_count, workers, 8)
+        assert [p for start, end in ranges for p in range(start, end)] == list(range(page_count))
+        assert all(end - start >= 8 for start, end in ranges[:-1])
+
+
+def _numbered_pdf(tmp_path, pages):
+    return write_text_pdf(tmp_path / "long.pdf", [f"Page {i} of the report" for i in range(pages)])
+
+
+def test_parallel_parse_keeps_page_order(tmp_path):
+    pdf = _numbered_pdf(tmp_path, 150)
+    parser = PDFParser(backend="pypdf", workers=4, parallel_min_pages=64, cache_dir="")
+    try:
+        parsed = parser.parse(pdf)
+        assert parser._pool is not None  # took the parallel path
+    finally:
+        parser.shutdown()
+
+    assert parsed.pages == PDFParser(backend="pypdf", workers=1, cache_dir="").parse(pdf).pages
+    assert [page.strip() for page in parsed.pages] == [f"Page {i} of the report" for i in range(150)]
+
+
+def test_crashed_worker_falls_back_in_process_and_replaces_the_pool(tmp_path):
+    pdf = _numbered_pdf(tmp_path, 80)
+    parser = PDFParser(backend="pypdf", workers=2, parallel_min_pages=64, cache_dir="")
+    try:
+        broken = parser._get_pool()
+        with pytest.raises(Exception):
+            broken.submit(os._exit, 1).result()  # Kills a worker, breaking the pool
+
+        parsed = parser.parse(pdf)
+        assert parsed.page_count == 80 and parsed.pages[79].strip() == "Page 79 of the report"
+        assert parser._pool is None
+
+        # The next parallel parse runs on a fresh pool
+        assert parser.parse(pdf).pages == parsed.pages
+        assert parser._pool is not None and parser._pool is not broken
+    finally:
+        parser.shutdown()
+
+
+def test_repeated_parse_is_served_from_cache(tmp_path):
+    pdf = _write_pdf(tmp_path / "a.pdf", "a")
+    parser = _parser(tmp_path / "cache", max_entries=10)
+
+    first = parser.parse(pdf)
+    second = parser.parse(pdf)
+
+    assert not first.cached and second.cached
+    assert second.pages == first.pages and second.content_hash == first.content_hash
+    assert [p.suffix for p in (tmp_path / "cache").iterdir()] == [".json"]
+
+
+def test_cache_keeps_most_recently_used_entries(tmp_path):
+    cache = tmp_path / "cache"
+    parser = _parser(cache, max_entries=2)
+    pdfs = [_write_pdf(tmp_path / f"{name}.pdf", name) for name in "abc"]
+    hashes = {}
+
+    for i, pdf in enumerate(pdfs[:2]):
+        hashes[pdf] = parser.parse(pdf).content_hash
+        # Distinct mtimes regardless of filesystem timestamp resolution
+        os.utime(parser._cache_path(hashes[pdf]), (1000 + i, 1000 + i))
+
+    # A cache hit refreshes "a", so adding "c" prunes "b"
+    assert parser.parse(pdfs[0]).cached
+    hashes[pdfs[2]] = parser.parse(pdfs[2]).content_hash
+
+    assert len(list(cache.glob("*.json"))) == 2
+    assert parser._cache_path(hashes[pdfs[0]]).exists()
+    assert not parser._cache_path(hashes[pdfs[1]]).exists()
+    assert not parser.parse(pdfs[1]).cached
+
+
+def test_zero_max_entries_keeps_every_entry(tmp_path):
+    cache = tmp_path / "cache"
+    parser = _parser(cache, max_entries=0)
+    for name in "abc":
+        parser.parse(_write_pdf(tmp_path / f"{name}.pdf", name))
+    assert len(list(cache.glob("*.json"))) == 3
+
+
+def test_concurrent_parses_from_threads(tmp_path):
+    pdfs = [_write_pdf(tmp_path / f"{i}.pdf", str(i)) for i in range(6)]
+    parser = _parser(tmp_path / "cache", max_entries=4)
+
+    async def parse_all():
+        return await asyncio.gather(*(asyncio.to_thread(parser.parse, pdf) for pdf in pdfs))
+
+    results = asyncio.run(parse_all())
+    assert [r.page_count for r in results] == [1] * 6
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 4
+    assert not list((tmp_path / "cache").glob("*.tmp"))
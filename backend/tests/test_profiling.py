@@ -0,0 +1,170 @@
+"""
+Request profiling tests: span traces, the slow-request log and profile files.
+
+Run from backend directory: python -m pytest tests/test_profiling.py
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.profiling import (
+    SLOW_LOG_NAME,
+    RequestProfiler,
+    current_trace,
+    trace_span,
+)
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    monkeypatch.setattr(settings, "profiling_format", "speedscope")
+    monkeypatch.setattr(settings, "slow_request_ms", 0)
+    return RequestProfiler()
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def _handler():
+    """Fake chat request: spans on the event loop and in a worker thread."""
+    with trace_span("retrieve"):
+        _busy(0.03)
+    with trace_span("embed"):
+        await asyncio.to_thread(_busy, 0.03)
+    with pytest.raises(RuntimeError):
+        with trace_span("llm"):
+            raise RuntimeError("upstream failed")
+
+
+def _request(profiler, profile, status_code=200):
+    """Run the fake request the way the HTTP middleware does."""
+    async def run():
+        trace, sampler, token = profiler.start("POST", "/api/chat", profile)
+        try:
+            await _handler()
+        finally:
+            record = profiler.finish(trace, sampler, token, status_code)
+        prefix = None
+        if sampler is not None:
+            prefix = await asyncio.to_thread(profiler.write_profile, record, sampler)
+        return record, prefix
+
+    return asyncio.run(run())
+
+
+def test_request_records_named_spans(profiler):
+    record, prefix = _request(profiler, profile=False)
+
+    assert prefix is None
+    assert current_trace() is None
+    assert record["method"] == "POST" and record["path"] == "/api/chat" and record["status_code"] == 200
+    assert [s["name"] for s in record["spans"]] == ["retrieve", "embed", "llm"]
+    retrieve, embed, llm = record["spans"]
+    assert retrieve["duration_ms"] >= 30 and retrieve["error"] is None
+    assert embed["start_ms"] >= retrieve["start_ms"] + retrieve["duration_ms"]
+    assert llm["error"] == "RuntimeError"
+    assert record["duration_ms"] >= sum(s["duration_ms"] for s in record["spans"])
+
+
+def test_untraced_spans_are_no_ops():
+    with trace_span("retrieve") as span:
+        assert current_trace() is None
+    with trace_span("embed") as other:
+        assert other is span
+
+
+def test_only_requests_over_the_threshold_are_slow_logged(profiler, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "slow_request_ms", 10_000)
+    _request(profiler, profile=False)
+    assert not profiler.slow_requests
+    assert not (tmp_path / SLOW_LOG_NAME).exists()
+
+    monkeypatch.setattr(settings, "slow_request_ms", 1)
+    record, _ = _request(profiler, profile=False, status_code=500)
+    assert list(profiler.slow_requests) == [record]
+    logged = [json.loads(line) for line in (tmp_path / SLOW_LOG_NAME).read_text().splitlines()]
+    assert logged == [record]
+
+
+def test_profiled_request_writes_trace_and_speedscope(profiler, tmp_path):
+    record, prefix = _request(profiler, profile=True)
+
+    assert prefix.endswith(record["request_id"])
+    trace = json.loads((tmp_path / f"{prefix}.trace.json").read_text())
+    assert trace == record
+
+    speedscope = json.loads((tmp_path / f"{prefix}.speedscope.json").read_text())
+    frames = speedscope["shared"]["frames"]
+    loop_profile, *thread_profiles = speedscope["profiles"]
+    # The request's own thread comes first, then each busy worker thread
+    assert loop_profile["name"] == f"POST /api/chat ({record['duration_ms']:.0f}ms) [MainThread]"
+    for profile in speedscope["profiles"]:
+        assert profile["type"] == "sampled"
+        assert profile["samples"] and len(profile["samples"]) == len(profile["weights"])
+
+    def leaf_names(profile):
+        return {frames[sample[-1]]["name"] for sample in profile["samples"]}
+
+    # retrieve busy-waits on the loop; embed busy-waits in an asyncio.to_thread worker
+    assert "_busy" in leaf_names(loop_profile)
+    workers = [p for p in thread_profiles if p["name"].endswith("[asyncio_0]")]
+    assert workers and "_busy" in leaf_names(workers[0])
+
+    assert [p["name"] for p in profiler.list_profiles()] == sorted(
+        [f"{prefix}.trace.json", f"{prefix}.speedscope.json"],
+        key=lambda name: (tmp_path / name).stat().st_mtime,
+        reverse=True,
+    )
+    assert profiler.profile_path(f"{prefix}.trace.json") is not None
+    assert profiler.profile_path("../secrets.json") is None
+
+
+def test_collapsed_stacks_are_labelled_by_thread(profiler, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "profiling_format", "collapsed")
+    _, prefix = _request(profiler, profile=True)
+
+    lines = (tmp_path / f"{prefix}.folded").read_text().splitlines()
+    threads = {line.split(";", 1)[0] for line in lines}
+    assert {"[MainThread]", "[asyncio_0]"} <= threads
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_profile_header_requires_the_admin_token(profiler, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "admin_token", "")
+    assert not profiler.should_profile({"x-profile": "1"})
+
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    assert not profiler.should_profile({"x-profile": "1"})
+    assert not profiler.should_profile({"x-profile": "1", "x-admin-token": "wrong"})
+    assert not profiler.should_profile({"x-admin-token": "secret"})
+    assert profiler.should_profile({"x-profile": "1", "x-admin-token": "secret"})
+
+    monkeypatch.setattr(settings, "profiling_enabled", False)
+    assert not profiler.should_profile({"x-profile": "1", "x-admin-token": "secret"})
+
+
+def test_oldest_profiles_are_pruned(profiler, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "profiling_max_profiles", 2)
+    prefixes = []
+    for i in range(3):
+        _, prefix = _request(profiler, profile=True)
+        prefixes.append(prefix)
+        # Distinct mtimes regardless of filesystem timestamp resolution
+        for path in tmp_path.glob(f"{prefix}.*"):
+            os.utime(path, (1000 + i, 1000 + i))
+
+    remaining = {p.name.split(".")[0] for p in tmp_path.iterdir()}
+    assert remaining == set(prefixes[1:])
+    assert len(list(tmp_path.glob("*.speedscope.json"))) == 2
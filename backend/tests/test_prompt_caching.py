@@ -0,0 +1,101 @@
+"""
+Prompt caching tests against a local fake Anthropic endpoint.
+
+Run from backend directory: python -m pytest tests/test_prompt_caching.py
+"""
+
+import asyncio
+import json
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.documents import Document
+
+from app.services.prompts import (
+    build_direct_messages,
+    build_rag_messages,
+    extract_usage,
+    order_context,
+    system_prompt,
+)
+from tests.fake_anthropic import FakeAnthropicServer
+
+
+OWNER = "Tangzihan Xia"
+
+DOCS = [
+    Document(page_content="Worked as a software engineering intern at Kiroku.", metadata={"source": "resume.pdf", "page": 1}),
+    Document(page_content="Teaching assistant for CS1010S at NUS.", metadata={"source": "resume.pdf", "page": 0}),
+    Document(page_content="Built an agentic AI workshop for Ignite 2025.", metadata={"source": "projects.pdf", "page": 3}),
+]
+
+# Long enough that system prompt plus context exceeds the minimum cacheable prefix
+LONG_DOCS = [
+    Document(page_content=" ".join([doc.page_content] * 100), metadata=doc.metadata) for doc in DOCS
+]
+
+
+def _ask(server: FakeAnthropicServer, docs, query: str):
+    llm = ChatAnthropic(model="fake-model", anthropic_api_key="test", base_url=server.base_url, max_retries=0)
+    return asyncio.run(llm.ainvoke(build_rag_messages(docs, query, OWNER)))
+
+
+def test_context_order_is_independent_of_retrieval_order():
+    assert order_context(DOCS) == order_context(list(reversed(DOCS)))
+    assert [d.metadata["source"] for d in order_context(DOCS)] == ["projects.pdf", "resume.pdf", "resume.pdf"]
+
+
+def test_request_carries_cache_breakpoints():
+    with FakeAnthropicServer() as server:
+        _ask(server, DOCS, "Where did Tangzihan intern?")
+        body = server.requests[-1]["body"]
+
+    assert body["system"] == [{"type": "text", "text": system_prompt(OWNER), "cache_control": {"type": "ephemeral"}}]
+    context_block, question_block = body["messages"][0]["content"]
+    assert context_block["cache_control"] == {"type": "ephemeral"}
+    assert context_block["text"].startswith("Context:\n")
+    assert "cache_control" not in question_block
+    assert "Where did Tangzihan intern?" in question_block["text"]
+
+
+def test_repeated_context_is_reported_as_cached():
+    with FakeAnthropicServer() as server:
+        first = extract_usage(_ask(server, LONG_DOCS, "Where did Tangzihan intern?"))
+        # Same chunks retrieved in a different order, different question
+        second = extract_usage(_ask(server, list(reversed(LONG_DOCS)), "What did Tangzihan teach?"))
+        third = extract_usage(_ask(server, LONG_DOCS[:1], "Anything else?"))
+
+    assert first["cached_input_tokens"] == 0
+    assert first["cache_creation_input_tokens"] > 0
+
+    assert second["cached_input_tokens"] == first["cache_creation_input_tokens"]
+    assert second["uncached_input_tokens"] == second["input_tokens"] - second["cached_input_tokens"]
+
+    # Different context is a new prefix; the system prompt alone is too short to be cached
+    assert third["cached_input_tokens"] == 0
+    assert third["cache_creation_input_tokens"] > 0
+
+
+def test_prefixes_below_the_minimum_are_not_cached():
+    with FakeAnthropicServer() as server:
+        llm = ChatAnthropic(model="fake-model", anthropic_api_key="test", base_url=server.base_url, max_retries=0)
+        rag = [extract_usage(_ask(server, DOCS, "Where did Tangzihan intern?")) for _ in range(2)]
+        direct = [extract_usage(asyncio.run(llm.ainvoke(build_direct_messages("Hi", OWNER)))) for _ in range(2)]
+        direct_body = server.requests[-1]["body"]
+
+    for usage in rag + direct:
+        assert usage["cached_input_tokens"] == 0
+        assert usage["cache_creation_input_tokens"] == 0
+        assert usage["uncached_input_tokens"] == usage["input_tokens"]
+    # Direct prompts never reach the minimum, so they carry no breakpoint
+    assert "cache_control" not in json.dumps(direct_body)
+
+
+def test_system_prompt_names_the_tenant_owner():
+    assert "Jane Doe's portfolio website" in system_prompt("Jane Doe")
+    assert system_prompt("Jane Doe") == system_prompt("Jane Doe")  # stable, so cacheable per tenant
+
+    rag = build_rag_messages(DOCS, "Who is this?", owner=None)[0].content[0]["text"]
+    direct = build_direct_messages("Who is this?", owner=None)[0].content
+    for prompt in (rag, direct):
+        assert "Tangzihan" not in prompt
+        assert "this portfolio website" in prompt
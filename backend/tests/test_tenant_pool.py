@@ -0,0 +1,272 @@
+"""
+Tenant pool tests: LRU and idle eviction, lazy open, and bounded memory across many tenants,
+plus tenant isolation, owners and metrics through RAGService on a temporary Chroma database.
+
+Run from backend directory: python -m pytest tests/test_tenant_pool.py
+"""
+
+import asyncio
+import threading
+import time
+import tracemalloc
+
+from langchain_anthropic import ChatAnthropic
+
+from app.core.config import settings
+from app.services.metadata_index import MetadataIndex
+from app.services.tenant_pool import (
+    DEFAULT_COLLECTION,
+    InvalidTenantError,
+    TenantPool,
+    TenantStore,
+    collection_name,
+    resolve_tenant_id,
+)
+from tests.fake_anthropic import FakeAnthropicServer
+from tests.fake_documents import write_text_pdf
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeOpener:
+    """Opens stores for tenants in `existing` (or any tenant when create=True)."""
+
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.opened = []
+
+    def __call__(self, tenant_id, create):
+        if not create and tenant_id not in self.existing:
+            return None
+        self.existing.add(tenant_id)
+        self.opened.append(tenant_id)
+        return TenantStore(tenant_id, vectorstore=None, metadata_index=MetadataIndex())
+
+
+def test_resolve_tenant_id_and_collection_names():
+    assert resolve_tenant_id(None) == settings.default_tenant
+    assert resolve_tenant_id("  Acme-Corp ") == "acme-corp"
+    assert collection_name(settings.default_tenant) == DEFAULT_COLLECTION
+    assert collection_name("documents") != DEFAULT_COLLECTION
+    for bad in ("-acme", "acme_", "a/b", "x" * 49, "acme corp"):
+        try:
+            resolve_tenant_id(bad)
+        except InvalidTenantError:
+            continue
+        raise AssertionError(f"expected InvalidTenantError for {bad!r}")
+
+
+def test_lru_evicts_least_recently_used():
+    opener = FakeOpener()
+    pool = TenantPool(opener, max_open=2, idle_seconds=0, clock=FakeClock())
+
+    first = pool.get("a")
+    pool.get("b")
+    assert pool.get("a") is first  # hit; "b" is now least recently used
+    pool.get("c")
+
+    assert "a" in pool and "c" in pool and "b" not in pool
+    assert opener.opened == ["a", "b", "c"]
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
+
+    pool.get("b")  # reopened lazily
+    assert opener.opened[-1] == "b"
+    assert pool.metrics("b").opens == 2
+
+
+def test_idle_stores_are_closed():
+    clock = FakeClock()
+    pool = TenantPool(FakeOpener(), max_open=10, idle_seconds=60, clock=clock)
+    pool.get("a")
+    clock.now += 30
+    pool.get("b")
+    clock.now += 40  # "a" idle for 70s, "b" for 40s
+
+    assert pool.close_idle() == 1
+    assert "a" not in pool and "b" in pool
+    assert pool.stats()["idle_closes"] == 1
+
+
+def test_reads_never_create_tenants():
+    opener = FakeOpener(existing={"acme"})
+    pool = TenantPool(opener, max_open=4, idle_seconds=0, clock=FakeClock())
+
+    assert pool.get("unknown", create=False) is None
+    assert len(pool) == 0
+    assert pool.get("acme", create=False) is not None
+    assert pool.get("unknown", create=True) is not None
+    assert opener.opened == ["acme", "unknown"]
+
+
+def test_concurrent_async_misses_share_one_open_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def slow_opener(tenant_id, create):
+        threads.append(threading.get_ident())
+        time.sleep(0.05)  # Stands in for the metadata index rebuild
+        return FakeOpener()(tenant_id, create)
+
+    pool = TenantPool(slow_opener, max_open=4, idle_seconds=0, clock=FakeClock())
+
+    async def run():
+        ticks = 0
+        ticks_at_open = []
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        async def get(tenant_id):
+            store = await pool.aget(tenant_id)
+            ticks_at_open.append(ticks)
+            return store
+
+        *stores, _ = await asyncio.gather(*(get("acme") for _ in range(5)), get("other"), ticker())
+        return stores, ticks_at_open
+
+    stores, ticks_at_open = asyncio.run(run())
+
+    assert len(threads) == 2 and loop_thread not in threads
+    assert all(store is stores[0] for store in stores[:5]) and stores[5].tenant_id == "other"
+    # The event loop kept serving other work while the stores were opened
+    assert min(ticks_at_open) > 0
+    assert pool.stats()["misses"] == 2 and pool.metrics("acme").opens == 1
+    assert asyncio.run(pool.aget("acme")) is stores[0]
+    assert not pool._opening
+
+
+def test_async_reads_never_create_tenants():
+    opener = FakeOpener(existing={"acme"})
+    pool = TenantPool(opener, max_open=4, idle_seconds=0, clock=FakeClock())
+
+    assert asyncio.run(pool.aget("unknown", create=False)) is None
+    assert asyncio.run(pool.aget("acme", create=False)) is not None
+    assert len(pool) == 1 and opener.opened == ["acme"]
+
+
+def test_metrics_are_per_tenant_and_bounded():
+    pool = TenantPool(FakeOpener(), max_open=2, max_metrics=3, clock=FakeClock())
+    pool.metrics("a").record_chat("rag", 0.2)
+    pool.metrics("a").record_chat("error", 0.1)
+    pool.metrics("b").record_ingest(12, ok=True)
+
+    stats = {t["tenant"]: t for t in pool.tenant_stats()}
+    assert stats["a"]["chats"] == 2 and stats["a"]["chat_errors"] == 1
+    assert stats["a"]["modes"] == {"rag": 1, "error": 1}
+    assert stats["a"]["avg_chat_ms"] == 150.0
+    assert stats["b"]["chunks_ingested"] == 12 and stats["b"]["chats"] == 0
+
+    for tenant_id in ("c", "d"):
+        pool.metrics(tenant_id)
+    assert [t["tenant"] for t in pool.tenant_stats()] == ["d", "c", "b"]
+
+
+def test_memory_stays_flat_across_thousands_of_tenants():
+    def opener(tenant_id, create):
+        # Stands in for the collection handle and its loaded index
+        return TenantStore(tenant_id, bytearray(64 * 1024), MetadataIndex())
+
+    pool = TenantPool(opener, max_open=16, idle_seconds=0, max_metrics=500, clock=FakeClock())
+
+    def touch(tenants):
+        for i in tenants:
+            tenant_id = f"tenant-{i}"
+            pool.get(tenant_id)
+            pool.metrics(tenant_id).record_chat("rag", 0.01)
+
+    tracemalloc.start()
+    try:
+        touch(range(1000))
+        after_first, _ = tracemalloc.get_traced_memory()
+        touch(range(1000, 5000))
+        after_all, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(pool) == 16
+    assert pool.stats()["tracked_tenants"] == 500
+    # 4x more tenants, same footprint: bounded by the pool, not the tenant count
+    assert after_all < after_first * 1.1
+
+
+def _collections(service):
+    return {c if isinstance(c, str) else c.name for c in service.chroma_client.list_collections()}
+
+
+def _ingest(service, tmp_path, tenant):
+    pdf = write_text_pdf(tmp_path / f"{tenant}.pdf", ["Software engineering intern at Kiroku."])
+    result = asyncio.run(service.ingest_pdf(pdf, metadata={"source": "resume.pdf"}, tenant=tenant))
+    assert result["status"] == "success" and result["tenant"] == tenant
+
+
+def _chat(service, tenant, reply="Hi."):
+    with FakeAnthropicServer(reply=reply) as server:
+        service.llm = ChatAnthropic(model="fake-model", anthropic_api_key="test", base_url=server.base_url, max_retries=0)
+        result = asyncio.run(service.chat("Where did they intern?", tenant=tenant, deadline_ms=5000))
+        return result, server.requests[-1]["body"]
+
+
+def test_tenants_are_isolated_through_the_service(service, tmp_path):
+    _ingest(service, tmp_path, "acme")
+
+    result, body = _chat(service, "globex")
+    assert result["mode"] == "direct_llm" and result["document_count"] == 0
+    assert "Kiroku" not in str(body)
+    assert asyncio.run(service.list_documents("globex")) == []
+    assert asyncio.run(service.delete_document("resume.pdf", tenant="globex"))["deleted"] == 0
+
+    result, body = _chat(service, "acme")
+    assert result["mode"] == "rag" and result["document_count"] == 1
+    assert "Kiroku" in str(body)
+    assert [d["source"] for d in asyncio.run(service.list_documents("acme"))] == ["resume.pdf"]
+    assert asyncio.run(service.list_documents()) == []  # the default tenant is separate too
+
+
+def test_reads_of_unknown_tenants_create_nothing(service):
+    before = _collections(service)
+
+    _chat(service, "ghost")
+    asyncio.run(service.list_documents("ghost"))
+    asyncio.run(service.delete_document("resume.pdf", tenant="ghost"))
+    stats = asyncio.run(service.get_vector_store_stats("ghost"))
+
+    assert stats["document_count"] == 0
+    assert _collections(service) == before
+    assert "ghost" not in service.tenants
+    assert "ghost" not in [t["tenant"] for t in service.tenants.tenant_stats()]
+
+
+def test_unknown_tenants_cannot_evict_real_tenant_metrics(service, tmp_path):
+    service.tenants.max_metrics = 2
+    _ingest(service, tmp_path, "acme")
+    _chat(service, "acme")
+
+    for i in range(5):
+        _chat(service, f"random-{i}")
+
+    stats = {t["tenant"]: t for t in service.tenants.tenant_stats()}
+    assert list(stats) == ["acme"]
+    assert stats["acme"]["chats"] == 1 and stats["acme"]["chunks_ingested"] == 1
+
+
+def test_owner_survives_close_and_reopen(service, tmp_path):
+    _ingest(service, tmp_path, "acme")
+    assert asyncio.run(service.set_tenant_owner("acme", "Jane Doe"))["status"] == "success"
+
+    assert service.tenants.close("acme")
+    assert asyncio.run(service.get_vector_store_stats("acme"))["owner"] == "Jane Doe"
+
+    service.tenants.close("acme")
+    _, body = _chat(service, "acme")
+    assert "Jane Doe's portfolio website" in body["system"][0]["text"]
+    assert service.tenants.metrics("acme").opens == 3